@@ -0,0 +1,257 @@
+""" Age grading of road running performances.
+
+The standards are read from a CSV table file, no table is bundled. Convert
+the official WMA road running age-grading tables (open standards and age
+factors per sex) into the format below and point `PACER_PY_AGE_GRADING_TABLE`
+at the file, or pass its path to `load_tables`.
+
+    sex,age,5000,10000,21097.5,42195
+    M,open,769,1577,3451,7269
+    M,5,0.4572,0.4497,0.4435,0.4386
+    ...
+
+The header lists the standard distances in meters. Every sex has one 'open'
+row with the open class standards in seconds and one row of age factors per
+age, ages between listed ones are interpolated linearly. The ages a sex can
+be graded for are the ages its rows cover.
+"""
+import bisect
+import csv
+import functools
+import math
+import os
+from array import array
+from typing import Any
+
+from rich import print
+
+import pacer_py.math as ppm
+import pacer_py.user_interface as ui
+from pacer_py.jobs import Job
+
+SEXES = ('M', 'F')
+TABLE_ENV_VAR = 'PACER_PY_AGE_GRADING_TABLE'
+# Number of interpolated distances kept, enough for the distances of a results file.
+DISTANCE_CACHE_SIZE = 256
+
+AgeFactorRows = list[tuple[int, list[float]]]
+
+
+def read_table_file(path: str | os.PathLike[str]) -> tuple[list[float], dict[str, list[float]], dict[str, AgeFactorRows]]:
+    """Read an age grading table file.
+
+    Args:
+        path (str | os.PathLike): CSV file in the format of the module docstring.
+
+    Returns:
+        tuple: Standard distances in meters, open standards in seconds per
+               sex and (age, age factors) rows per sex sorted by age.
+
+    Raises:
+        ValueError: If the file can't be read or is not a valid table.
+    """
+    open_standards: dict[str, list[float]] = {}
+    age_factors: dict[str, AgeFactorRows] = {sex: [] for sex in SEXES}
+    try:
+        with open(path, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            if header[:2] != ['sex', 'age'] or len(header) < 4:
+                raise ValueError("the header must be 'sex,age' followed by at least two distances in meters")
+            distances_m = [float(d) for d in header[2:]]
+            if any(d <= 0 for d in distances_m) or distances_m != sorted(set(distances_m)):
+                raise ValueError("the distances must be positive and increasing")
+            for row in reader:
+                if not row:
+                    continue
+                if len(row) != len(header) or row[0] not in SEXES:
+                    raise ValueError(f"line {reader.line_num} needs a sex of {', '.join(SEXES)} "
+                                     f"and {len(header) - 1} values")
+                values = [float(v) for v in row[2:]]
+                if any(v <= 0 for v in values):
+                    raise ValueError(f"line {reader.line_num} has values that are not greater than zero")
+                if row[1] == 'open':
+                    open_standards[row[0]] = values
+                else:
+                    age_factors[row[0]].append((int(row[1]), values))
+    except OSError as e:
+        raise ValueError(f"Age grading table '{path}' can't be read: {e}") from e
+    except ValueError as e:
+        raise ValueError(f"Age grading table '{path}' is invalid: {e}") from e
+
+    for sex in SEXES:
+        age_factors[sex].sort()
+        if sex not in open_standards or not age_factors[sex]:
+            raise ValueError(f"Age grading table '{path}' is invalid: sex {sex} needs an 'open' row and age rows")
+        ages = [age for age, _ in age_factors[sex]]
+        if len(set(ages)) != len(ages):
+            raise ValueError(f"Age grading table '{path}' is invalid: sex {sex} lists an age twice")
+    return distances_m, open_standards, age_factors
+
+
+class AgeGradingTables:
+    """Age grading standards expanded into flat arrays.
+
+    Age factors are expanded to every age a sex covers once. The
+    interpolation between standard distances is cached for the last
+    DISTANCE_CACHE_SIZE distances, so scoring a performance is a lookup and
+    a division.
+    """
+
+    def __init__(self, distances_m: list[float], open_standards: dict[str, list[float]],
+                 age_factors: dict[str, AgeFactorRows]) -> None:
+        self.n_distances = len(distances_m)
+        self.distances_m = array('d', distances_m)
+        self.log_distances = array('d', (math.log(d) for d in distances_m))
+        self.log_open_standards = {sex: array('d', (math.log(t) for t in open_standards[sex])) for sex in SEXES}
+        self.min_age = {sex: age_factors[sex][0][0] for sex in SEXES}
+        self.max_age = {sex: age_factors[sex][-1][0] for sex in SEXES}
+        # Age factors of a sex, age-major: factors[(age - min_age) * n_distances + distance_index]
+        self.factors = {sex: self._expand_age_factors(age_factors[sex]) for sex in SEXES}
+        self._distance_cache: dict[tuple[str, float], tuple[float, array[float]]] = {}
+
+    @classmethod
+    def from_file(cls, path: str | os.PathLike[str]) -> 'AgeGradingTables':
+        """Build the tables from a table file, see `read_table_file`."""
+        return cls(*read_table_file(path))
+
+    def _expand_age_factors(self, rows: AgeFactorRows) -> array[float]:
+        min_age, max_age = rows[0][0], rows[-1][0]
+        if len(rows) == 1:
+            return array('d', rows[0][1])
+        row_ages = [age for age, _ in rows]
+        factors = array('d', [0.0]) * ((max_age - min_age + 1) * self.n_distances)
+        for age in range(min_age, max_age + 1):
+            i = min(bisect.bisect_right(row_ages, age) - 1, len(rows) - 2)
+            (age_lo, factors_lo), (age_hi, factors_hi) = rows[i], rows[i + 1]
+            w = (age - age_lo) / (age_hi - age_lo)
+            for d in range(self.n_distances):
+                factors[(age - min_age) * self.n_distances + d] = factors_lo[d] + w * (factors_hi[d] - factors_lo[d])
+        return factors
+
+    def distance_standards(self, distance_m: float, sex: str) -> tuple[float, array[float]]:
+        """Open standard and age factors for a distance.
+
+        Non-standard distances are interpolated in log distance between the
+        neighbouring standard distances. The result is cached per distance,
+        the oldest distance is dropped once the cache is full.
+
+        Args:
+            distance_m (float): Distance in meters.
+            sex (str): 'M' or 'F'.
+
+        Returns:
+            tuple: Open standard in seconds and age factors indexed by age - min_age.
+        """
+        key = (sex, distance_m)
+        cached = self._distance_cache.get(key)
+        if cached is not None:
+            return cached
+        if sex not in SEXES:
+            raise ValueError(f"Sex must be one of {', '.join(SEXES)}.")
+        if not self.distances_m[0] <= distance_m <= self.distances_m[-1]:
+            raise ValueError(f"Age grading is only available for distances from "
+                             f"{self.distances_m[0]:.0f}m to {self.distances_m[-1]:.0f}m.")
+
+        i = min(bisect.bisect_right(self.distances_m, distance_m) - 1, self.n_distances - 2)
+        w = (math.log(distance_m) - self.log_distances[i]) / (self.log_distances[i + 1] - self.log_distances[i])
+        log_standards = self.log_open_standards[sex]
+        open_standard = math.exp(log_standards[i] + w * (log_standards[i + 1] - log_standards[i]))
+        factors = self.factors[sex]
+        age_factors = array('d', (
+            factors[a + i] + w * (factors[a + i + 1] - factors[a + i])
+            for a in range(0, len(factors), self.n_distances)
+        ))
+        if len(self._distance_cache) >= DISTANCE_CACHE_SIZE:
+            del self._distance_cache[next(iter(self._distance_cache))]
+        standards = self._distance_cache[key] = (open_standard, age_factors)
+        return standards
+
+    def age_grade(self, distance_m: float, duration_sec: float, age: int, sex: str) -> tuple[float, float]:
+        """Age grade a performance.
+
+        Args:
+            distance_m (float): Distance in meters.
+            duration_sec (float): Finish time in seconds.
+            age (int): Age of the athlete on race day.
+            sex (str): 'M' or 'F'.
+
+        Returns:
+            tuple: Age grade in percent and the equivalent open class time in seconds.
+        """
+        if duration_sec <= 0:
+            raise ValueError("Duration must be greater than zero.")
+        open_standard, age_factors = self.distance_standards(distance_m, sex)
+        if not self.min_age[sex] <= age <= self.max_age[sex]:
+            raise ValueError(f"Age grading is only available for ages from {self.min_age[sex]} to {self.max_age[sex]}.")
+        factor = age_factors[age - self.min_age[sex]]
+        return 100.0 * open_standard / (duration_sec * factor), duration_sec * factor
+
+
+def load_tables(path: str | os.PathLike[str] | None = None) -> AgeGradingTables:
+    """Load the age grading tables on first use.
+
+    Args:
+        path (str | os.PathLike | None): Table file, defaults to the file
+            named by the `PACER_PY_AGE_GRADING_TABLE` environment variable.
+
+    Raises:
+        ValueError: If no table file is configured or it is invalid.
+    """
+    if path is None:
+        path = os.environ.get(TABLE_ENV_VAR)
+        if not path:
+            raise ValueError(f"No age grading table configured. Convert the official WMA road running "
+                             f"age-grading tables to CSV (see pacer_py.age_grading) and set {TABLE_ENV_VAR} "
+                             f"to its path.")
+    return _load_table_file(os.fspath(path))
+
+
+@functools.cache
+def _load_table_file(path: str) -> AgeGradingTables:
+    return AgeGradingTables.from_file(path)
+
+
+def age_grade(distance_m: float, duration_sec: float, age: int, sex: str) -> tuple[float, float]:
+    """Age grade a performance, see `AgeGradingTables.age_grade`."""
+    return load_tables().age_grade(distance_m, duration_sec, age, sex)
+
+
+class CalculateAgeGrade(Job):
+    input_keys = ('distance', 'duration', 'age', 'sex')
+    output_keys = ('age_grade_percent', 'open_duration')
+
+    def __str__(self) -> str:
+        return "Start Age Grading Calculator"
+
+    def user_request(self) -> dict[str, Any]:
+        user_readings: dict[str, int | float | str] = {}
+        try:
+            user_readings['distance'] = ui.ask_user_for_distance()
+            user_readings['duration'] = ui.ask_user_for_duration()
+            user_readings['age'] = ui.ask_user_for_age()
+            user_readings['sex'] = ui.ask_user_for_sex()
+        except ValueError as e:
+            print(f"Error: {e}")
+            return {}
+        return user_readings
+
+    def execute(self, user_input: dict[str, Any]) -> dict[str, Any]:
+        distance_m = user_input.get('distance')
+        duration_sec = user_input.get('duration')
+        age = user_input.get('age')
+        sex = user_input.get('sex')
+        if distance_m is None or duration_sec is None or age is None or sex is None:
+            raise ValueError("Missing distance, duration, age or sex in user input.")
+        age_grade_percent, open_duration_sec = age_grade(distance_m, duration_sec, age, sex)
+        return {'age_grade_percent': age_grade_percent, 'open_duration': open_duration_sec}
+
+    def user_response(self, result: dict[str, Any]) -> None:
+        age_grade_reading = result.get('age_grade_percent')
+        open_duration_reading = result.get('open_duration')
+        if not isinstance(age_grade_reading, float) or not isinstance(open_duration_reading, float):
+            raise ValueError("Missing age grade in result.")
+
+        open_split = ppm.duration_to_hh_mm_ss(open_duration_reading, 'sec')
+        print(f"Age grade: {age_grade_reading:.2f} %")
+        print(f"Equivalent open time: {open_split[0]:02d}:{open_split[1]:02d}:{open_split[2]:02d} hh:mm:ss")
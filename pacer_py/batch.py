@@ -0,0 +1,185 @@
+""" Non-interactive batch processing of CSV files."""
+import csv
+import itertools
+import tracemalloc
+import warnings
+from collections.abc import Callable, Iterable
+from typing import Any, TextIO
+
+import pacer_py.user_input_parser as parser
+from pacer_py.jobs import Job
+
+INPUT_PARSERS: dict[str, Callable[[str], Any]] = {
+    'distance': parser.parse_distance,
+    'duration': parser.parse_duration,
+    'pace': parser.parse_pace,
+    'age': parser.parse_age,
+    'sex': parser.parse_sex,
+}
+
+DEFAULT_CHUNK_SIZE = 1000
+MAX_CHUNK_SIZE = 100_000
+# Chunk size used to measure the memory per row before the first adaptation.
+PROBE_CHUNK_SIZE = 64
+# Fraction of the memory budget a chunk may use, the rest is headroom for estimation errors.
+BUDGET_FILL_FACTOR = 0.8
+
+STAGES = ('parse', 'execute', 'render')
+
+
+def parse_row(row: dict[str, str], input_keys: Iterable[str] | None = None) -> dict[str, Any]:
+    """Parse the known columns of a batch row into job input.
+
+    Args:
+        row (dict[str, str]): Column name mapped to the raw value.
+        input_keys (Iterable[str] | None): Columns the job consumes, other
+            columns are ignored. None parses all known columns.
+
+    Returns:
+        dict: Parsed values of the non-empty columns.
+
+    Raises:
+        ValueError: If a value can't be parsed.
+    """
+    keys = INPUT_PARSERS if input_keys is None else input_keys
+    return {key: INPUT_PARSERS[key](value) for key in keys if key in INPUT_PARSERS and (value := row.get(key))}
+
+
+class _Stage:
+    """Measures how much traced memory a batch stage allocates on top of what was alive before it."""
+
+    def __init__(self, report: dict[str, int], name: str) -> None:
+        self.report = report
+        self.key = f'{name}_peak_bytes'
+        self.start = 0
+        self.peak = 0
+
+    def __enter__(self) -> '_Stage':
+        if tracemalloc.is_tracing():
+            self.start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if tracemalloc.is_tracing():
+            self.peak = tracemalloc.get_traced_memory()[1]
+            self.report[self.key] = max(self.report[self.key], self.peak - self.start)
+
+
+def run_batch(job: Job, rows: Iterable[dict[str, str]], out: TextIO, memory_budget_bytes: int | None = None,
+              chunk_size: int = DEFAULT_CHUNK_SIZE, profile: bool = False) -> dict[str, int]:
+    """Run a job for every row and write the results as CSV.
+
+    Rows are processed in chunks, so memory does not grow with the input as
+    long as `rows` is streamed (e.g. a `csv.DictReader`). Rows that fail to
+    parse or execute are written with their error message. The output columns
+    are the job's `output_keys`. Jobs without them get the keys of the first
+    successful result of the first chunk, or only the error column.
+
+    Args:
+        job (Job): Job to execute for every row.
+        rows (Iterable[dict[str, str]]): Raw input rows.
+        out (TextIO): Stream the result CSV is written to.
+        memory_budget_bytes (int | None): Ceiling for the traced memory the
+            batch run allocates, measured from its start, so memory held by
+            the caller before the run is not counted but memory kept across
+            chunks is. The chunk size is adapted after every chunk to stay
+            below it.
+        chunk_size (int): Rows per chunk if no memory budget is given.
+        profile (bool): Measure per-stage allocation peaks without a budget.
+
+    Returns:
+        dict: Number of rows and chunks, the last chunk size and, when
+              profiling, the peak allocation of every stage and chunk in
+              bytes and the number of chunks that exceeded the budget.
+              Exceeding chunks are also reported as a ResourceWarning.
+
+    Raises:
+        MemoryError: If a single row, on top of the memory kept across
+            chunks, exceeds the memory budget.
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least one row.")
+    if memory_budget_bytes is not None and memory_budget_bytes <= 0:
+        raise ValueError("Memory budget must be greater than zero.")
+
+    report = {'rows': 0, 'chunks': 0, 'chunk_size': chunk_size, 'peak_bytes': 0, 'over_budget_chunks': 0}
+    report.update({f'{stage}_peak_bytes': 0 for stage in STAGES})
+    if memory_budget_bytes is not None:
+        report['chunk_size'] = PROBE_CHUNK_SIZE
+
+    started_tracing = (memory_budget_bytes is not None or profile) and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    iterator = iter(rows)
+    writer: csv.DictWriter[str] | None = None
+    try:
+        batch_base = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+        while True:
+            chunk_base = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+            chunk_start = report['rows'] + 1
+
+            with _Stage(report, 'parse') as parse_stage:
+                chunk = list(itertools.islice(iterator, report['chunk_size']))
+                inputs: list[dict[str, Any] | str] = []
+                for row in chunk:
+                    try:
+                        inputs.append(parse_row(row, job.input_keys))
+                    except ValueError as e:
+                        inputs.append(str(e))
+                del chunk
+            if not inputs:
+                break
+
+            with _Stage(report, 'execute') as execute_stage:
+                results: list[dict[str, Any]] = []
+                for user_input in inputs:
+                    if isinstance(user_input, str):
+                        results.append({'error': user_input})
+                        continue
+                    try:
+                        results.append(job.execute(user_input))
+                    except ValueError as e:
+                        results.append({'error': str(e)})
+                del inputs
+
+            with _Stage(report, 'render') as render_stage:
+                if writer is None:
+                    output_keys = job.output_keys or next((tuple(r) for r in results if 'error' not in r), ())
+                    writer = csv.DictWriter(out, fieldnames=['row', *output_keys, 'error'], extrasaction='ignore')
+                    writer.writeheader()
+                writer.writerows({'row': n, **result} for n, result in enumerate(results, start=chunk_start))
+
+            report['rows'] += len(results)
+            report['chunks'] += 1
+            if tracemalloc.is_tracing():
+                chunk_peak = max(parse_stage.peak, execute_stage.peak, render_stage.peak)
+                report['peak_bytes'] = max(report['peak_bytes'], chunk_peak - batch_base)
+                if memory_budget_bytes is not None:
+                    if chunk_peak - batch_base > memory_budget_bytes:
+                        if len(results) == 1:
+                            raise MemoryError(f"Row {chunk_start} brings the batch to {chunk_peak - batch_base} bytes, "
+                                              f"more than the memory budget of {memory_budget_bytes} bytes.")
+                        report['over_budget_chunks'] += 1
+                    # Memory kept across chunks (e.g. by the output) shrinks the room for the next chunk.
+                    retained = tracemalloc.get_traced_memory()[0] - batch_base
+                    report['chunk_size'] = _adapt_chunk_size(len(results), chunk_peak - chunk_base,
+                                                             memory_budget_bytes - retained)
+            del results
+
+        if writer is None:
+            writer = csv.DictWriter(out, fieldnames=['row', *job.output_keys, 'error'], extrasaction='ignore')
+            writer.writeheader()
+        if report['over_budget_chunks']:
+            warnings.warn(f"{report['over_budget_chunks']} of {report['chunks']} chunks exceeded the memory budget "
+                          f"of {memory_budget_bytes} bytes (peak {report['peak_bytes']} bytes).", ResourceWarning)
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+    return report
+
+
+def _adapt_chunk_size(rows: int, chunk_growth: int, available_bytes: int) -> int:
+    """Size the next chunk from the memory the last chunk allocated per row."""
+    bytes_per_row = max(chunk_growth, 1) / rows
+    return int(min(max(available_bytes * BUDGET_FILL_FACTOR / bytes_per_row, 1), MAX_CHUNK_SIZE))
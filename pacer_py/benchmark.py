@@ -0,0 +1,268 @@
+""" Benchmark suite for parsers, math functions and jobs.
+
+Run with `python bin/pacer_bench` and compare against a saved baseline to
+catch performance regressions.
+"""
+import argparse
+import json
+import os
+import random
+import time
+import tracemalloc
+from collections.abc import Callable, Sequence
+from typing import Any
+
+import pacer_py.downsample as downsample
+import pacer_py.math as ppm
+import pacer_py.user_input_parser as parser
+from pacer_py.age_grading import CalculateAgeGrade, load_tables
+from pacer_py.batch import run_batch
+from pacer_py.jobs import CalculateDistance, CalculateDuration, CalculatePace
+
+Result = dict[str, float]
+
+
+def duration_corpus(n: int, seed: int = 0) -> list[str]:
+    """Generate valid duration strings in all supported formats."""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(n):
+        h, m, s = rng.randrange(10), rng.randrange(60), rng.randrange(60)
+        corpus.append([f"{h:02d}:{m:02d}:{s:02d}", f"{m}:{s:02d}", str(s + 60 * m)][i % 3])
+    return corpus
+
+
+def invalid_duration_corpus(n: int, seed: int = 0) -> list[str]:
+    """Generate duration strings that fail to parse."""
+    rng = random.Random(seed)
+    templates = ["{a}:{b}:{c}:{a}", "{a}::{b}", "-{a}:{b}", "{a}:7{b}", "{a}:xx", "abc"]
+    return [templates[i % len(templates)].format(a=rng.randrange(10), b=rng.randrange(10), c=rng.randrange(10))
+            for i in range(n)]
+
+
+def distance_corpus(n: int, seed: int = 0) -> list[str]:
+    """Generate valid distance strings in all supported formats."""
+    rng = random.Random(seed)
+    templates = ["{v}km", "{v}k", "{v}m", " {v} KM ", "marathon", "half marathon"]
+    return [templates[i % len(templates)].format(v=round(rng.uniform(0.1, 100.0), 2)) for i in range(n)]
+
+
+def invalid_distance_corpus(n: int, seed: int = 0) -> list[str]:
+    """Generate distance strings that fail to parse."""
+    rng = random.Random(seed)
+    templates = ["{v}miles", "{v}", "km", "{v}.{v}.{v}km", "-{v}k", "abc m"]
+    return [templates[i % len(templates)].format(v=rng.randrange(1, 100)) for i in range(n)]
+
+
+def pace_corpus(n: int, seed: int = 0) -> list[str]:
+    """Generate valid pace strings in all supported formats."""
+    rng = random.Random(seed)
+    templates = ["{m}:{s:02d}/km", "{m}:{s:02d} min/km", "{m} min/km", "{t} sec/km", "{m}:{s:02d}/m"]
+    return [templates[i % len(templates)].format(m=rng.randrange(3, 10), s=rng.randrange(60), t=rng.randrange(150, 600))
+            for i in range(n)]
+
+
+def invalid_pace_corpus(n: int, seed: int = 0) -> list[str]:
+    """Generate pace strings that fail to parse."""
+    rng = random.Random(seed)
+    templates = ["{m}:{s:02d}", "{m}:{s:02d}perkm", "{m}.{s}.{s}/km", "abc/km", "{m}:{s}:{s}:{s}/km"]
+    return [templates[i % len(templates)].format(m=rng.randrange(3, 10), s=rng.randrange(60)) for i in range(n)]
+
+
+def activity_stream(n: int, seed: int = 0) -> tuple[list[float], list[float], list[float]]:
+    """Generate distance, elevation and time streams of a hilly activity with n samples."""
+    rng = random.Random(seed)
+    distance, elevation, time_sec = [0.0], [100.0], [0.0]
+    for _ in range(n - 1):
+        distance.append(distance[-1] + rng.uniform(2.0, 4.0))
+        elevation.append(elevation[-1] + rng.uniform(-0.3, 0.3))
+        time_sec.append(time_sec[-1] + 1.0)
+    return distance, elevation, time_sec
+
+
+def batch_corpus(n: int, seed: int = 0) -> list[dict[str, str]]:
+    """Generate batch rows with distance and duration columns."""
+    return [{'distance': distance, 'duration': duration}
+            for distance, duration in zip(distance_corpus(n, seed), duration_corpus(n, seed))]
+
+
+def _parse_all(parse: Callable[[str], Any], corpus: Sequence[str]) -> Callable[[], None]:
+    def op() -> None:
+        for text in corpus:
+            parse(text)
+    return op
+
+
+def _reject_all(parse: Callable[[str], Any], corpus: Sequence[str]) -> Callable[[], None]:
+    def op() -> None:
+        for text in corpus:
+            try:
+                parse(text)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"'{text}' was expected to be invalid.")
+    return op
+
+
+def _call(func: Callable[..., Any], *args: Any) -> Callable[[], None]:
+    def op() -> None:
+        func(*args)
+    return op
+
+
+def _execute_all(job: Any, inputs: Sequence[dict[str, Any]]) -> Callable[[], None]:
+    def op() -> None:
+        for user_input in inputs:
+            job.execute(user_input)
+    return op
+
+
+def _batch(rows: Sequence[dict[str, str]]) -> Callable[[], None]:
+    job = CalculatePace()
+
+    def op() -> None:
+        with open(os.devnull, 'w') as out:
+            run_batch(job, rows, out)
+    return op
+
+
+def benchmark_cases(size: int = 1000, stream_size: int = 100_000) -> dict[str, tuple[Callable[[], None], int]]:
+    """Build all benchmark cases.
+
+    Args:
+        size (int): Number of strings/rows per parser, job and batch corpus.
+        stream_size (int): Number of samples of the activity streams.
+
+    Returns:
+        dict: Case name mapped to the operation and the number of items it
+              processes. The age grading case needs a configured age grading
+              table and is left out without one.
+    """
+    distance, elevation, time_sec = activity_stream(stream_size)
+    paces = ppm.pace_series_from_stream(distance, time_sec, 'min/km')
+    rng = random.Random(0)
+    numbers = [(rng.uniform(600, 20000), rng.uniform(1000, 50000), rng.uniform(0.15, 0.6)) for _ in range(size)]
+    options = {i: f"Option {i}" for i in range(1, 10)}
+    option_corpus = [str(1 + i % 9) for i in range(size)]
+
+    def math_op() -> None:
+        for duration, distance_m, pace in numbers:
+            ppm.pace_from_duration_and_distance(duration, distance_m, 'min/km')
+            ppm.duration_from_pace_and_distance(pace, distance_m)
+            ppm.distance_from_pace_and_duration(pace, duration, 'm')
+            ppm.duration_to_hh_mm_ss(duration, 'sec')
+
+    cases: dict[str, tuple[Callable[[], None], int]] = {
+        'parse_duration': (_parse_all(parser.parse_duration, duration_corpus(size)), size),
+        'parse_duration_invalid': (_reject_all(parser.parse_duration, invalid_duration_corpus(size)), size),
+        'parse_distance': (_parse_all(parser.parse_distance, distance_corpus(size)), size),
+        'parse_distance_invalid': (_reject_all(parser.parse_distance, invalid_distance_corpus(size)), size),
+        'parse_pace': (_parse_all(parser.parse_pace, pace_corpus(size)), size),
+        'parse_pace_invalid': (_reject_all(parser.parse_pace, invalid_pace_corpus(size)), size),
+        'parse_option': (_parse_all(lambda text: parser.parse_option(text, options), option_corpus), size),
+        'math_scalar': (math_op, size),
+        'math_grade_adjusted_pace': (_call(ppm.grade_adjusted_pace, distance, elevation, time_sec, 'min/km'), stream_size),
+        'math_pace_series': (_call(ppm.pace_series_from_stream, distance, time_sec, 'min/km'), stream_size),
+        'downsample_lttb': (_call(downsample.lttb, distance[1:], paces, 200), stream_size),
+        'job_calculate_pace': (_execute_all(CalculatePace(), [{'distance': d, 'duration': t} for t, d, _ in numbers]), size),
+        'job_calculate_duration': (_execute_all(CalculateDuration(), [{'pace': p, 'distance': d} for _, d, p in numbers]), size),
+        'job_calculate_distance': (_execute_all(CalculateDistance(), [{'pace': p, 'duration': t} for t, _, p in numbers]), size),
+        'batch_pace': (_batch(batch_corpus(size)), size),
+    }
+    try:
+        tables = load_tables()
+    except ValueError:
+        # Age grading needs a table file, see pacer_py.age_grading.
+        return cases
+    ages = range(max(tables.min_age.values()), min(tables.max_age.values()) + 1)
+    cases['job_age_grade'] = (_execute_all(CalculateAgeGrade(), [
+        {'distance': 10000.0, 'duration': t % 5000 + 1600, 'age': ages[i % len(ages)], 'sex': 'MF'[i % 2]}
+        for i, (t, _, _) in enumerate(numbers)]), size)
+    return cases
+
+
+def measure(op: Callable[[], None], items: int, min_time_sec: float = 0.2) -> Result:
+    """Measure throughput and allocation peak of an operation.
+
+    Args:
+        op (Callable): Operation to measure, processing `items` items per call.
+        items (int): Number of items processed by one call.
+        min_time_sec (float): Minimum time to repeat the operation for.
+
+    Returns:
+        dict: 'ops_per_sec' (items per second) and 'peak_bytes' (allocation peak of one call).
+    """
+    op()  # warm up
+    calls = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time_sec or calls == 0:
+        op()
+        calls += 1
+        elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        op()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'ops_per_sec': calls * items / elapsed, 'peak_bytes': float(peak_bytes)}
+
+
+def run_benchmarks(cases: dict[str, tuple[Callable[[], None], int]], min_time_sec: float = 0.2,
+                   pattern: str = "") -> dict[str, Result]:
+    """Measure all cases whose name contains `pattern`."""
+    return {name: measure(op, items, min_time_sec) for name, (op, items) in cases.items() if pattern in name}
+
+
+def find_regressions(results: dict[str, Result], baseline: dict[str, Result], threshold: float) -> list[str]:
+    """Compare results against a baseline.
+
+    Args:
+        results (dict): Current benchmark results.
+        baseline (dict): Saved benchmark results.
+        threshold (float): Allowed relative change, e.g. 0.2 for 20 %.
+
+    Returns:
+        list: Description of every case that got slower or allocates more than allowed.
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if result['ops_per_sec'] < reference['ops_per_sec'] * (1.0 - threshold):
+            regressions.append(f"{name}: {result['ops_per_sec']:.0f} ops/sec, baseline {reference['ops_per_sec']:.0f} ops/sec")
+        if result['peak_bytes'] > reference['peak_bytes'] * (1.0 + threshold):
+            regressions.append(f"{name}: {result['peak_bytes']:.0f} peak bytes, baseline {reference['peak_bytes']:.0f} peak bytes")
+    return regressions
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Benchmark pacer_py parsers, math functions and jobs.")
+    arg_parser.add_argument('--size', type=int, default=1000, help="strings/rows per corpus")
+    arg_parser.add_argument('--stream-size', type=int, default=100_000, help="samples per activity stream")
+    arg_parser.add_argument('--min-time', type=float, default=0.2, help="minimum seconds per case")
+    arg_parser.add_argument('--filter', default="", help="only run cases containing this text")
+    arg_parser.add_argument('--save', help="write results to this baseline JSON file")
+    arg_parser.add_argument('--baseline', help="compare results against this baseline JSON file")
+    arg_parser.add_argument('--threshold', type=float, default=0.2, help="allowed relative regression")
+    args = arg_parser.parse_args(argv)
+
+    results = run_benchmarks(benchmark_cases(args.size, args.stream_size), args.min_time, args.filter)
+    for name, result in results.items():
+        print(f"{name:<28} {result['ops_per_sec']:>14,.0f} ops/sec {result['peak_bytes']:>14,.0f} peak bytes")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(results, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            return 1
+    return 0
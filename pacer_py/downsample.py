@@ -0,0 +1,100 @@
+from array import array
+from collections.abc import Sequence
+
+
+def _check_series(x: Sequence[float], y: Sequence[float], n_points: int) -> None:
+    if len(x) != len(y):
+        raise ValueError("X and Y series must have the same length.")
+    if n_points < 1:
+        raise ValueError("Number of points must be at least one.")
+
+
+def lttb(x: Sequence[float], y: Sequence[float], n_points: int) -> tuple[array[float], array[float]]:
+    """Downsample a series with the Largest-Triangle-Three-Buckets algorithm.
+
+    Keeps the first and last point and from every bucket in between the point
+    spanning the largest triangle with its neighbours, which preserves the
+    visual shape of the series. Runs in O(n).
+
+    Args:
+        x (Sequence[float]): X values, e.g. distance in meters (ascending).
+        y (Sequence[float]): Y values, e.g. pace in min/km.
+        n_points (int): Number of points to keep.
+
+    Returns:
+        tuple: Downsampled X and Y values.
+    """
+    _check_series(x, y, n_points)
+    n = len(x)
+    if n_points >= n:
+        return array('d', x), array('d', y)
+    if n_points < 3:
+        indices = [0, n - 1][:n_points]
+        return array('d', (x[i] for i in indices)), array('d', (y[i] for i in indices))
+
+    out_x = array('d', [x[0]])
+    out_y = array('d', [y[0]])
+    bucket_size = (n - 2) / (n_points - 2)
+    a = 0
+    for bucket in range(n_points - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+
+        # Average of the next bucket is the third corner of the triangle.
+        next_start = end
+        next_end = min(int((bucket + 2) * bucket_size) + 1, n)
+        next_count = next_end - next_start
+        avg_x = sum(x[next_start:next_end]) / next_count
+        avg_y = sum(y[next_start:next_end]) / next_count
+
+        ax, ay = x[a], y[a]
+        max_area = -1.0
+        selected = start
+        for i in range(start, end):
+            area = abs((ax - avg_x) * (y[i] - ay) - (ax - x[i]) * (avg_y - ay))
+            if area > max_area:
+                max_area = area
+                selected = i
+        out_x.append(x[selected])
+        out_y.append(y[selected])
+        a = selected
+
+    out_x.append(x[-1])
+    out_y.append(y[-1])
+    return out_x, out_y
+
+
+def min_max_buckets(x: Sequence[float], y: Sequence[float], n_buckets: int) -> tuple[array[float], array[float]]:
+    """Downsample a series by keeping the minimum and maximum of every bucket.
+
+    Keeps all peaks of the series, at most two points per bucket. Runs in O(n).
+
+    Args:
+        x (Sequence[float]): X values, e.g. distance in meters (ascending).
+        y (Sequence[float]): Y values, e.g. pace in min/km.
+        n_buckets (int): Number of buckets.
+
+    Returns:
+        tuple: Downsampled X and Y values.
+    """
+    _check_series(x, y, n_buckets)
+    n = len(x)
+    if 2 * n_buckets >= n:
+        return array('d', x), array('d', y)
+
+    out_x = array('d')
+    out_y = array('d')
+    bucket_size = n / n_buckets
+    for bucket in range(n_buckets):
+        start = int(bucket * bucket_size)
+        end = int((bucket + 1) * bucket_size)
+        i_min = i_max = start
+        for i in range(start + 1, end):
+            if y[i] < y[i_min]:
+                i_min = i
+            elif y[i] > y[i_max]:
+                i_max = i
+        for i in sorted({i_min, i_max}):
+            out_x.append(x[i])
+            out_y.append(y[i])
+    return out_x, out_y
@@ -1,4 +1,6 @@
 import abc
+import importlib
+import importlib.metadata
 from typing import Any
 
 from rich import print
@@ -6,10 +8,17 @@ from rich import print
 import pacer_py.user_interface as ui
 import pacer_py.math as ppm
 
+JOB_ENTRY_POINT_GROUP = 'pacer_py.jobs'
+
 
 class Job(abc.ABC):
     
     """Abstract base class for different jobs."""
+    # Keys of the input of `execute`, used to parse batch columns (None parses all known columns).
+    input_keys: tuple[str, ...] | None = None
+    # Keys of the result of `execute`, used as batch output columns.
+    output_keys: tuple[str, ...] = ()
+
     @abc.abstractmethod
     def user_request(self) -> dict[str, Any]:
         raise NotImplementedError("Subclasses must implement this method.")
@@ -23,6 +32,9 @@ class Job(abc.ABC):
 
     
 class CalculatePace(Job):
+    input_keys = ('distance', 'duration')
+    output_keys = ('pace_min_per_km',)
+
     def __str__(self) -> str:
         return "Start Pace Calculator"
 
@@ -53,6 +65,9 @@ class CalculatePace(Job):
         print(f"Pace: {pace_split[1]:02d}:{pace_split[2]:02d} min/km")
 
 class CalculateDuration(Job):
+    input_keys = ('pace', 'distance')
+    output_keys = ('duration',)
+
     def __str__(self) -> str:
         return "Start Duration Calculator"
     
@@ -86,6 +101,9 @@ class CalculateDuration(Job):
             print(f"Duration: {duration_split[0]:02d}:{duration_split[1]:02d}:{duration_split[2]:02d} hh:mm:ss")
 
 class CalculateDistance(Job):
+    input_keys = ('pace', 'duration')
+    output_keys = ('distance_m',)
+
     def __str__(self) -> str:
         return "Start Distance Calculator"
     
@@ -120,6 +138,8 @@ class CalculateDistance(Job):
 
 
 class ExitApplication(Job):
+    input_keys = ()
+
     def __str__(self) -> str:
         return "Exit Application"
     
@@ -135,26 +155,114 @@ class ExitApplication(Job):
 
 
 class JobFactory:
+    """Registry of jobs, selectable by menu number or by a stable name.
 
-    def __init__(self) -> None:
-        self.jobs: dict[int, Job] = {}
+    Jobs can be registered as instances or as 'module:Class' paths, which
+    are only imported when the job is selected. Further jobs are discovered
+    through the entry point group `entry_point_group` of installed packages.
+    """
 
-    def register_job(self, job: Job) -> None:
-        n = len(self.jobs) + 1
-        self.jobs[n] = job
+    def __init__(self, entry_point_group: str | None = JOB_ENTRY_POINT_GROUP) -> None:
+        self.entry_point_group = entry_point_group
+        self.registry: dict[str, tuple[Job | importlib.metadata.EntryPoint, str | None]] = {}
+        self.default_job_name: str | None = None
+        self._loaded: dict[str, Job] = {}
+        self._discovered = entry_point_group is None
+
+    def register_job(self, name: str, job: Job | importlib.metadata.EntryPoint | str, label: str | None = None) -> None:
+        """Register a job under a stable name.
+
+        Args:
+            name (str): Stable name used to select the job non-interactively.
+            job (Job | EntryPoint | str): Job instance, entry point or
+                'module:Class' path of a Job subclass.
+            label (str | None): Menu label, defaults to `str` of the job if it
+                is already loaded and to the name otherwise.
+        """
+        if isinstance(job, str):
+            job = importlib.metadata.EntryPoint(name, job, self.entry_point_group or JOB_ENTRY_POINT_GROUP)
+        if isinstance(job, Job):
+            self._loaded[name] = job
+        else:
+            self._loaded.pop(name, None)
+        self.registry[name] = (job, label)
+
+    def register_default_job(self, name: str) -> None:
+        self.default_job_name = name
+
+    def discover_entry_points(self) -> None:
+        """Register all jobs advertised by installed packages, without importing them."""
+        self._discovered = True
+        if self.entry_point_group is None:
+            return
+        for entry_point in importlib.metadata.entry_points(group=self.entry_point_group):
+            if entry_point.name not in self.registry:
+                self.register_job(entry_point.name, entry_point)
+
+    def names(self) -> list[str]:
+        """Stable names of all jobs, in menu order with the default job last."""
+        if not self._discovered:
+            self.discover_entry_points()
+        names = [name for name in self.registry if name != self.default_job_name]
+        if self.default_job_name in self.registry:
+            names.append(self.default_job_name)
+        return names
+
+    def get_job(self, name: str) -> Job:
+        """Return the job registered under `name`, importing it on first use.
+
+        Raises:
+            ValueError: If no job is registered under the name, it can't be
+                imported or it is no Job.
+        """
+        job = self._loaded.get(name)
+        if job is not None:
+            return job
+        if name not in self.registry and not self._discovered:
+            self.discover_entry_points()
+        if name not in self.registry:
+            raise ValueError(f"Unknown job '{name}'. Available jobs: {', '.join(self.names())}")
+
+        entry_point, _ = self.registry[name]
+        if isinstance(entry_point, Job):
+            return entry_point
+        try:
+            job_class = entry_point.load()
+        except (ImportError, AttributeError, ValueError) as e:
+            raise ValueError(f"Job '{name}' ({entry_point.value}) can't be loaded: {e}") from e
+        if not (isinstance(job_class, type) and issubclass(job_class, Job)):
+            raise ValueError(f"Job '{name}' ({entry_point.value}) is not a Job subclass.")
+        job = job_class()
+        self._loaded[name] = job
+        return job
+
+    def label(self, name: str) -> str:
+        """Menu label of a job.
+
+        The registered label, `str` of the job if it is already loaded or the
+        stable name. Jobs are never imported just to show the menu.
+        """
+        _, label = self.registry[name]
+        if label is not None:
+            return label
+        job = self._loaded.get(name)
+        return str(job) if job is not None else name
 
-    def register_default_job(self, job: Job) -> None:
-        self.default_job = job
-    
     def ask_user(self) -> Job:
-        opt = {key: str(value) for key, value in self.jobs.items()}
+        names = self.names()
+        opt = {n: self.label(name) for n, name in enumerate(names, start=1)}
         job_id = ui.ask_user_for_option(opt)
-        return self.jobs.get(job_id, self.default_job)
+        if 1 <= job_id <= len(names):
+            return self.get_job(names[job_id - 1])
+        if self.default_job_name is None:
+            raise ValueError("No job selected and no default job registered.")
+        return self.get_job(self.default_job_name)
 
 
 job_factory = JobFactory()
-job_factory.register_job(CalculatePace())
-job_factory.register_job(CalculateDuration())
-job_factory.register_job(CalculateDistance())
-job_factory.register_job(ExitApplication())
-job_factory.register_default_job(ExitApplication())
\ No newline at end of file
+job_factory.register_job('pace', 'pacer_py.jobs:CalculatePace', "Start Pace Calculator")
+job_factory.register_job('duration', 'pacer_py.jobs:CalculateDuration', "Start Duration Calculator")
+job_factory.register_job('distance', 'pacer_py.jobs:CalculateDistance', "Start Distance Calculator")
+job_factory.register_job('age-grade', 'pacer_py.age_grading:CalculateAgeGrade', "Start Age Grading Calculator")
+job_factory.register_job('exit', 'pacer_py.jobs:ExitApplication', "Exit Application")
+job_factory.register_default_job('exit')
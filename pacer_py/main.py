@@ -1,11 +1,90 @@
 """ Main entry point for the pacer_py application."""
+import argparse
+import csv
+import sys
+from array import array
+from collections.abc import Sequence
+
+from rich import print
+
+import pacer_py.math as ppm
+import pacer_py.user_interface as ui
+from pacer_py.batch import STAGES, run_batch
 from pacer_py.jobs import job_factory
 
 
-def main() -> None:
-    
+def main(argv: Sequence[str] | None = None) -> None:
+    arg_parser = argparse.ArgumentParser(description="Pace, duration and distance calculator.")
+    arg_parser.add_argument('--batch', metavar='CSV', help="run a job for every row of a CSV file instead of asking")
+    arg_parser.add_argument('--job', help="name of the job to run in batch mode, e.g. 'pace'")
+    arg_parser.add_argument('--output', metavar='CSV', help="write batch results to this file instead of stdout")
+    arg_parser.add_argument('--memory-budget', type=float, metavar='MB', help="keep batch memory below this ceiling")
+    arg_parser.add_argument('--profile', action='store_true', help="report per-stage allocation peaks of a batch run")
+    arg_parser.add_argument('--activity', metavar='CSV',
+                            help="show pace profile and splits of an activity stream (distance, elevation, time columns)")
+    args = arg_parser.parse_args(argv)
+
+    if args.batch:
+        run_batch_file(args.batch, args.job, args.output, args.memory_budget, args.profile)
+        return
+    if args.activity:
+        show_activity_file(args.activity)
+        return
+
     job = job_factory.ask_user()
 
     user_inputs = job.user_request()
     user_results = job.execute(user_inputs)
     job.user_response(user_results)
+
+
+def run_batch_file(input_path: str, job_name: str | None, output_path: str | None,
+                   memory_budget_mb: float | None, profile: bool) -> None:
+    """Run a job for every row of a CSV file and write the results as CSV."""
+    if job_name is None:
+        raise SystemExit(f"Batch mode needs a --job, available jobs: {', '.join(job_factory.names())}")
+    try:
+        job = job_factory.get_job(job_name)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    memory_budget_bytes = int(memory_budget_mb * 1024 * 1024) if memory_budget_mb is not None else None
+
+    with open(input_path, newline='') as input_file:
+        output_file = open(output_path, 'w', newline='') if output_path else sys.stdout
+        try:
+            report = run_batch(job, csv.DictReader(input_file), output_file, memory_budget_bytes, profile=profile)
+        finally:
+            if output_file is not sys.stdout:
+                output_file.close()
+
+    if memory_budget_bytes is not None or profile:
+        print(f"Processed {report['rows']} rows in {report['chunks']} chunks.", file=sys.stderr)
+        for stage in STAGES:
+            print(f"{stage}: {report[f'{stage}_peak_bytes'] / 1024:.0f} KiB peak", file=sys.stderr)
+        if report['over_budget_chunks']:
+            print(f"{report['over_budget_chunks']} chunks exceeded the memory budget.", file=sys.stderr)
+
+
+def show_activity_file(input_path: str) -> None:
+    """Display grade adjusted pace, pace profile and splits of an activity stream CSV.
+
+    The CSV has the columns distance (m), elevation (m) and time (sec) with one row per sample.
+    """
+    distance_m, elevation_m, time_sec = array('d'), array('d'), array('d')
+    with open(input_path, newline='') as input_file:
+        try:
+            for row in csv.DictReader(input_file):
+                distance_m.append(float(row['distance']))
+                elevation_m.append(float(row['elevation']))
+                time_sec.append(float(row['time']))
+        except (KeyError, TypeError, ValueError) as e:
+            raise SystemExit(f"Activity '{input_path}' needs numeric distance, elevation and time columns: {e}")
+
+    try:
+        gap = ppm.grade_adjusted_pace(distance_m, elevation_m, time_sec, 'min/km')
+        pace_split = ppm.duration_to_hh_mm_ss(gap, 'min')
+        print(f"Grade adjusted pace: {pace_split[1]:02d}:{pace_split[2]:02d} min/km")
+        ui.display_pace_profile(distance_m, ppm.pace_series_from_stream(distance_m, time_sec, 'min/km'))
+        ui.display_splits(ppm.grade_adjusted_splits(distance_m, elevation_m, time_sec))
+    except ValueError as e:
+        raise SystemExit(str(e))
@@ -1,5 +1,6 @@
-
-
+from array import array
+from collections import deque
+from collections.abc import Sequence
 
 
 def duration_to_hh_mm_ss(time: float, unit: str) -> tuple[int, int, int]:
@@ -27,11 +28,11 @@ def duration_to_hh_mm_ss(time: float, unit: str) -> tuple[int, int, int]:
     return hours, minutes, seconds
 
 
-def pace_from_duration_and_distance(duration_sec: int, distance_m: float, target_format: str) -> float:
+def pace_from_duration_and_distance(duration_sec: float, distance_m: float, target_format: str) -> float:
     """Calculate pace in seconds per meter from duration and distance.
 
     Args:
-        duration_sec (int): Duration in seconds.
+        duration_sec (float): Duration in seconds.
         distance_m (float): Distance in meters.
         target_format (str): Target format for pace ('sec/m', 'min/km').
 
@@ -85,4 +86,246 @@ def distance_from_pace_and_duration(pace_sec_per_m: float, duration_sec: float,
     elif target_format == 'm':
         return duration_sec / pace_sec_per_m
     else:
-        raise ValueError(f"Unsupported target format: {target_format}.")
\ No newline at end of file
+        raise ValueError(f"Unsupported target format: {target_format}.")
+
+
+def pace_series_from_stream(distance_m: Sequence[float], time_sec: Sequence[float], target_format: str) -> array[float]:
+    """Calculate the pace of every segment between two consecutive samples.
+
+    Segments without distance (e.g. standing still) repeat the previous pace,
+    stationary segments at the start take the first pace of the activity.
+
+    Args:
+        distance_m (Sequence[float]): Cumulative distance samples in meters.
+        time_sec (Sequence[float]): Elapsed time samples in seconds.
+        target_format (str): Target format for pace ('sec/m', 'min/km').
+
+    Returns:
+        array: Pace per segment, one value less than the number of samples.
+
+    Raises:
+        ValueError: If the stream has segments but covers no distance.
+    """
+    if len(distance_m) != len(time_sec):
+        raise ValueError("Distance and time streams must have the same length.")
+    paces = array('d', [0.0]) * max(len(distance_m) - 1, 0)
+    last_pace: float | None = None
+    for i in range(1, len(distance_m)):
+        segment_m = distance_m[i] - distance_m[i - 1]
+        if segment_m > 0:
+            pace = pace_from_duration_and_distance(time_sec[i] - time_sec[i - 1], segment_m, target_format)
+            if last_pace is None:
+                # Fill the stationary segments at the start with the first pace.
+                for j in range(i - 1):
+                    paces[j] = pace
+            last_pace = pace
+        if last_pace is not None:
+            paces[i - 1] = last_pace
+    if paces and last_pace is None:
+        raise ValueError("Distance stream covers no distance.")
+    return paces
+
+
+# Minetti et al. (2002) energy cost of running is only measured for grades within +-45 %.
+MAX_GRADE = 0.45
+FLAT_ENERGY_COST = 3.6
+
+
+def energy_cost_of_running(grade: float) -> float:
+    """Calculate the energy cost of running on a given grade (Minetti model).
+
+    Args:
+        grade (float): Grade as rise over run (e.g. 0.05 for 5 %).
+                       Values outside +-45 % are clamped.
+
+    Returns:
+        float: Energy cost in J/(kg*m).
+    """
+    g = min(max(grade, -MAX_GRADE), MAX_GRADE)
+    return ((((155.4 * g - 30.4) * g - 43.3) * g + 46.3) * g + 19.5) * g + FLAT_ENERGY_COST
+
+
+def smooth_elevation(elevation_m: Sequence[float], window: int) -> array[float]:
+    """Smooth an elevation stream with a trailing moving average.
+
+    Args:
+        elevation_m (Sequence[float]): Elevation samples in meters.
+        window (int): Number of samples to average over.
+
+    Returns:
+        array: Smoothed elevation samples in meters.
+    """
+    if window < 1:
+        raise ValueError("Smoothing window must be at least one sample.")
+    smoothed = array('d', elevation_m)
+    running_sum = 0.0
+    for i, elevation in enumerate(elevation_m):
+        running_sum += elevation
+        if i >= window:
+            running_sum -= elevation_m[i - window]
+        smoothed[i] = running_sum / min(i + 1, window)
+    return smoothed
+
+
+def grade_from_distance_and_elevation(distance_m: Sequence[float], elevation_m: Sequence[float]) -> array[float]:
+    """Calculate the grade of every segment between two consecutive samples.
+
+    Args:
+        distance_m (Sequence[float]): Cumulative distance samples in meters.
+        elevation_m (Sequence[float]): Elevation samples in meters.
+
+    Returns:
+        array: Grade per segment, one value less than the number of samples.
+    """
+    if len(distance_m) != len(elevation_m):
+        raise ValueError("Distance and elevation streams must have the same length.")
+    grades = array('d', [0.0]) * max(len(distance_m) - 1, 0)
+    for i in range(1, len(distance_m)):
+        segment_m = distance_m[i] - distance_m[i - 1]
+        if segment_m < 0:
+            raise ValueError("Distance stream must not decrease.")
+        if segment_m > 0:
+            grades[i - 1] = (elevation_m[i] - elevation_m[i - 1]) / segment_m
+    return grades
+
+
+def grade_adjusted_distance(distance_m: Sequence[float], elevation_m: Sequence[float], smoothing_window: int = 5) -> array[float]:
+    """Calculate the cumulative equivalent flat distance of an elevation profile.
+
+    Args:
+        distance_m (Sequence[float]): Cumulative distance samples in meters.
+        elevation_m (Sequence[float]): Elevation samples in meters.
+        smoothing_window (int): Number of samples used to smooth the elevation.
+
+    Returns:
+        array: Cumulative equivalent flat distance in meters, one value per sample.
+    """
+    grades = grade_from_distance_and_elevation(distance_m, smooth_elevation(elevation_m, smoothing_window))
+    adjusted = array('d', [0.0]) * len(distance_m)
+    for i, grade in enumerate(grades, start=1):
+        segment_m = distance_m[i] - distance_m[i - 1]
+        adjusted[i] = adjusted[i - 1] + segment_m * energy_cost_of_running(grade) / FLAT_ENERGY_COST
+    return adjusted
+
+
+def grade_adjusted_pace(distance_m: Sequence[float], elevation_m: Sequence[float], time_sec: Sequence[float],
+                        target_format: str, smoothing_window: int = 5) -> float:
+    """Calculate the grade adjusted pace (GAP) of an activity stream.
+
+    Args:
+        distance_m (Sequence[float]): Cumulative distance samples in meters.
+        elevation_m (Sequence[float]): Elevation samples in meters.
+        time_sec (Sequence[float]): Elapsed time samples in seconds.
+        target_format (str): Target format for pace ('sec/m', 'min/km').
+        smoothing_window (int): Number of samples used to smooth the elevation.
+
+    Returns:
+        float: Pace on flat ground with the same energy cost.
+    """
+    if len(time_sec) != len(distance_m):
+        raise ValueError("Distance and time streams must have the same length.")
+    if len(time_sec) < 2:
+        raise ValueError("At least two samples are required to calculate a pace.")
+    adjusted_m = grade_adjusted_distance(distance_m, elevation_m, smoothing_window)
+    return pace_from_duration_and_distance(time_sec[-1] - time_sec[0], adjusted_m[-1], target_format)
+
+
+def grade_adjusted_splits(distance_m: Sequence[float], elevation_m: Sequence[float], time_sec: Sequence[float],
+                          split_m: float = 1000.0, smoothing_window: int = 5) -> list[float]:
+    """Calculate the grade adjusted pace of every split of an activity stream.
+
+    Args:
+        distance_m (Sequence[float]): Cumulative distance samples in meters.
+        elevation_m (Sequence[float]): Elevation samples in meters.
+        time_sec (Sequence[float]): Elapsed time samples in seconds.
+        split_m (float): Split length in meters.
+        smoothing_window (int): Number of samples used to smooth the elevation.
+
+    Returns:
+        list: Grade adjusted pace in min/km for every split, the last one may be partial.
+    """
+    if split_m <= 0:
+        raise ValueError("Split length must be greater than zero.")
+    if len(time_sec) != len(distance_m):
+        raise ValueError("Distance and time streams must have the same length.")
+    if len(time_sec) < 2:
+        raise ValueError("At least two samples are required to calculate a pace.")
+    adjusted_m = grade_adjusted_distance(distance_m, elevation_m, smoothing_window)
+
+    splits: list[float] = []
+    split_start_time, split_start_adjusted = time_sec[0], adjusted_m[0]
+    next_boundary = distance_m[0] + split_m
+    for i in range(1, len(distance_m)):
+        while distance_m[i] >= next_boundary:
+            # Interpolate time and adjusted distance at the split boundary.
+            fraction = (next_boundary - distance_m[i - 1]) / (distance_m[i] - distance_m[i - 1])
+            boundary_time = time_sec[i - 1] + fraction * (time_sec[i] - time_sec[i - 1])
+            boundary_adjusted = adjusted_m[i - 1] + fraction * (adjusted_m[i] - adjusted_m[i - 1])
+            splits.append(pace_from_duration_and_distance(boundary_time - split_start_time,
+                                                          boundary_adjusted - split_start_adjusted, 'min/km'))
+            split_start_time, split_start_adjusted = boundary_time, boundary_adjusted
+            next_boundary += split_m
+    if adjusted_m[-1] > split_start_adjusted:
+        splits.append(pace_from_duration_and_distance(time_sec[-1] - split_start_time,
+                                                      adjusted_m[-1] - split_start_adjusted, 'min/km'))
+    return splits
+
+
+class GradeAdjustedPaceStream:
+    """Incremental grade adjusted pace, updated one sample at a time.
+
+    Produces the same result as `grade_adjusted_pace` over the samples seen so far.
+    """
+
+    def __init__(self, smoothing_window: int = 5) -> None:
+        if smoothing_window < 1:
+            raise ValueError("Smoothing window must be at least one sample.")
+        self.smoothing_window = smoothing_window
+        self._elevation_window: deque[float] = deque()
+        self._elevation_sum = 0.0
+        self._last: tuple[float, float] | None = None
+        self._start_time_sec = 0.0
+        self.time_sec = 0.0
+        self.adjusted_distance_m = 0.0
+
+    def update(self, distance_m: float, elevation_m: float, time_sec: float) -> float:
+        """Add a sample to the stream.
+
+        Args:
+            distance_m (float): Cumulative distance in meters.
+            elevation_m (float): Elevation in meters.
+            time_sec (float): Elapsed time in seconds.
+
+        Returns:
+            float: Cumulative equivalent flat distance in meters.
+        """
+        self._elevation_window.append(elevation_m)
+        self._elevation_sum += elevation_m
+        if len(self._elevation_window) > self.smoothing_window:
+            self._elevation_sum -= self._elevation_window.popleft()
+        smoothed_m = self._elevation_sum / len(self._elevation_window)
+
+        if self._last is None:
+            self._start_time_sec = time_sec
+        else:
+            last_distance_m, last_smoothed_m = self._last
+            segment_m = distance_m - last_distance_m
+            if segment_m < 0:
+                raise ValueError("Distance stream must not decrease.")
+            if segment_m > 0:
+                grade = (smoothed_m - last_smoothed_m) / segment_m
+                self.adjusted_distance_m += segment_m * energy_cost_of_running(grade) / FLAT_ENERGY_COST
+        self._last = (distance_m, smoothed_m)
+        self.time_sec = time_sec
+        return self.adjusted_distance_m
+
+    def pace(self, target_format: str) -> float:
+        """Grade adjusted pace of all samples seen so far.
+
+        Args:
+            target_format (str): Target format for pace ('sec/m', 'min/km').
+
+        Returns:
+            float: Pace on flat ground with the same energy cost.
+        """
+        return pace_from_duration_and_distance(self.time_sec - self._start_time_sec, self.adjusted_distance_m, target_format)
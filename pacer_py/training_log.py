@@ -0,0 +1,241 @@
+""" Streaming aggregation of training logs into weekly and monthly rollups.
+
+A training log is a CSV file with the columns athlete, date (YYYY-MM-DD),
+distance and duration. Every row is read once and folded into running
+aggregates per athlete and period. The aggregates and the read position are
+saved as a compact JSON snapshot, so later updates only read new rows and
+queries are dictionary lookups.
+"""
+import csv
+import datetime
+import functools
+import hashlib
+import json
+import os
+from typing import Any, BinaryIO
+
+import pacer_py.math as ppm
+import pacer_py.user_input_parser as parser
+
+SNAPSHOT_VERSION = 1
+# Bytes at the start of the log and before the read position hashed to recognize the log.
+FINGERPRINT_BYTES = 4096
+
+# Pace histogram bins in sec/km: [120, 135), [135, 150), ... the last bin is open ended.
+PACE_HISTOGRAM_MIN_SEC_PER_KM = 120
+PACE_HISTOGRAM_BIN_SEC_PER_KM = 15
+PACE_HISTOGRAM_BINS = 48
+
+# Layout of an aggregate, a flat list to keep snapshots compact.
+RUNS, DISTANCE, DURATION, MIN_PACE, MAX_PACE, LONGEST, HISTOGRAM = range(7)
+
+parse_distance = functools.lru_cache(maxsize=4096)(parser.parse_distance)
+parse_duration = functools.lru_cache(maxsize=4096)(parser.parse_duration)
+
+
+def periods(day: datetime.date) -> tuple[str, str]:
+    """ISO week ('2024-W05') and month ('2024-01') a day belongs to."""
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}", f"{day.year}-{day.month:02d}"
+
+
+def pace_histogram_bin(pace_sec_per_km: float) -> int:
+    """Index of the pace histogram bin, paces outside the range go to the first or last bin."""
+    n = int((pace_sec_per_km - PACE_HISTOGRAM_MIN_SEC_PER_KM) // PACE_HISTOGRAM_BIN_SEC_PER_KM)
+    return min(max(n, 0), PACE_HISTOGRAM_BINS - 1)
+
+
+def log_fingerprint(f: BinaryIO, offset: int) -> str:
+    """Hash of the start of a log and the bytes before `offset`.
+
+    Cheap to recompute on every update and changes if the log is replaced
+    by another file, even a longer one.
+    """
+    digest = hashlib.sha256()
+    f.seek(0)
+    digest.update(f.read(min(offset, FINGERPRINT_BYTES)))
+    f.seek(max(offset - FINGERPRINT_BYTES, 0))
+    digest.update(f.read(min(offset, FINGERPRINT_BYTES)))
+    return digest.hexdigest()
+
+
+class TrainingLogAggregator:
+    """Weekly and monthly running aggregates per athlete."""
+
+    def __init__(self) -> None:
+        # athlete -> period -> [runs, distance_m, duration_sec, min_pace, max_pace, longest_m, histogram]
+        self.aggregates: dict[str, dict[str, list[Any]]] = {}
+        self.offset = 0
+        self.fieldnames: list[str] | None = None
+        self.skipped_rows = 0
+        self.in_multi_line_record = False
+        # Fingerprint of the log up to `offset`, None for snapshots that predate it.
+        self.fingerprint: str | None = None
+
+    def add_run(self, athlete: str, day: datetime.date, distance_m: float, duration_sec: float) -> None:
+        """Fold a single run into the weekly and monthly aggregates of the athlete."""
+        pace_sec_per_m = ppm.pace_from_duration_and_distance(duration_sec, distance_m, 'sec/m')
+        histogram_bin = pace_histogram_bin(pace_sec_per_m * 1000.0)
+        athlete_aggregates = self.aggregates.setdefault(athlete, {})
+        for period in periods(day):
+            aggregate = athlete_aggregates.get(period)
+            if aggregate is None:
+                aggregate = [0, 0.0, 0.0, pace_sec_per_m, pace_sec_per_m, 0.0, [0] * PACE_HISTOGRAM_BINS]
+                athlete_aggregates[period] = aggregate
+            aggregate[RUNS] += 1
+            aggregate[DISTANCE] += distance_m
+            aggregate[DURATION] += duration_sec
+            aggregate[MIN_PACE] = min(aggregate[MIN_PACE], pace_sec_per_m)
+            aggregate[MAX_PACE] = max(aggregate[MAX_PACE], pace_sec_per_m)
+            aggregate[LONGEST] = max(aggregate[LONGEST], distance_m)
+            aggregate[HISTOGRAM][histogram_bin] += 1
+
+    def add_row(self, row: dict[str, str]) -> None:
+        """Parse a log row and fold it into the aggregates.
+
+        Raises:
+            ValueError: If a value of the row can't be parsed.
+        """
+        try:
+            day = datetime.date.fromisoformat(row['date'].strip())
+        except (KeyError, AttributeError):
+            raise ValueError("Log row is missing a date.")
+        athlete = (row.get('athlete') or '').strip()
+        if not athlete:
+            raise ValueError("Log row is missing an athlete.")
+        self.add_run(athlete, day, parse_distance(row.get('distance') or ''), parse_duration(row.get('duration') or ''))
+
+    def update(self, log_path: str) -> int:
+        """Read the rows appended to a log since the last update.
+
+        Only complete lines are read, a partially written last line is picked
+        up by the next update. Every line is one record: records with quoted
+        fields spanning several lines are rejected. Rows that can't be
+        decoded or parsed and rejected records are counted in `skipped_rows`.
+
+        Args:
+            log_path (str): Path of the training log CSV file.
+
+        Returns:
+            int: Number of rows read.
+
+        Raises:
+            ValueError: If the log is shorter than the snapshot, doesn't match
+                its fingerprint or its header can't be read.
+        """
+        rows = 0
+        with open(log_path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() < self.offset:
+                raise ValueError(f"Training log '{log_path}' is shorter than the snapshot, it was replaced or truncated.")
+            if self.fingerprint is not None and log_fingerprint(f, self.offset) != self.fingerprint:
+                raise ValueError(f"Training log '{log_path}' doesn't match the snapshot, it was replaced or rewritten.")
+            f.seek(self.offset)
+            for line in iter(f.readline, b''):
+                if not line.endswith(b'\n'):
+                    break
+                if self.in_multi_line_record or line.count(b'"') % 2 == 1:
+                    # An odd number of quotes opens or closes a record spanning several lines.
+                    if self.fieldnames is None:
+                        raise ValueError(f"Header of training log '{log_path}' spans several lines.")
+                    if not self.in_multi_line_record:
+                        rows += 1
+                        self.skipped_rows += 1
+                    self.in_multi_line_record ^= line.count(b'"') % 2 == 1
+                    self.offset += len(line)
+                    continue
+                values: list[str] | None
+                try:
+                    values = next(csv.reader([line.decode('utf-8')], strict=True), [])
+                except (UnicodeDecodeError, csv.Error) as e:
+                    if self.fieldnames is None:
+                        raise ValueError(f"Header of training log '{log_path}' can't be read: {e}")
+                    values = None
+                self.offset += len(line)
+                if values == []:
+                    continue
+                if self.fieldnames is None:
+                    self.fieldnames = [name.strip().lower() for name in values or []]
+                    continue
+                rows += 1
+                try:
+                    if values is None:
+                        raise ValueError("Log line can't be decoded.")
+                    self.add_row(dict(zip(self.fieldnames, values)))
+                except ValueError:
+                    self.skipped_rows += 1
+            self.fingerprint = log_fingerprint(f, self.offset)
+        return rows
+
+    def summary(self, athlete: str, period: str) -> dict[str, Any] | None:
+        """Aggregates of an athlete for a week ('2024-W05') or month ('2024-01').
+
+        Returns:
+            dict | None: Number of runs, total distance and duration, average,
+                         fastest and slowest pace in min/km, longest run and the
+                         pace histogram, or None if there are no runs.
+        """
+        aggregate = self.aggregates.get(athlete, {}).get(period)
+        if aggregate is None:
+            return None
+        return {
+            'runs': aggregate[RUNS],
+            'distance_m': aggregate[DISTANCE],
+            'duration_sec': aggregate[DURATION],
+            'average_pace_min_per_km': ppm.pace_from_duration_and_distance(aggregate[DURATION], aggregate[DISTANCE], 'min/km'),
+            'fastest_pace_min_per_km': aggregate[MIN_PACE] * 1000.0 / 60.0,
+            'slowest_pace_min_per_km': aggregate[MAX_PACE] * 1000.0 / 60.0,
+            'longest_run_m': aggregate[LONGEST],
+            'pace_histogram': list(aggregate[HISTOGRAM]),
+        }
+
+    def weekly_summary(self, athlete: str, day: datetime.date) -> dict[str, Any] | None:
+        """Aggregates of the ISO week a day belongs to."""
+        return self.summary(athlete, periods(day)[0])
+
+    def monthly_summary(self, athlete: str, day: datetime.date) -> dict[str, Any] | None:
+        """Aggregates of the month a day belongs to."""
+        return self.summary(athlete, periods(day)[1])
+
+    def save(self, snapshot_path: str) -> None:
+        """Write the aggregates, read position and log fingerprint to a JSON snapshot."""
+        snapshot = {
+            'version': SNAPSHOT_VERSION,
+            'offset': self.offset,
+            'fieldnames': self.fieldnames,
+            'skipped_rows': self.skipped_rows,
+            'in_multi_line_record': self.in_multi_line_record,
+            'fingerprint': self.fingerprint,
+            'aggregates': self.aggregates,
+        }
+        tmp_path = f"{snapshot_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(snapshot, f, separators=(',', ':'))
+        os.replace(tmp_path, snapshot_path)
+
+    @classmethod
+    def load(cls, snapshot_path: str) -> 'TrainingLogAggregator':
+        """Read a JSON snapshot written by `save`."""
+        with open(snapshot_path) as f:
+            snapshot = json.load(f)
+        if snapshot.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {snapshot.get('version')}.")
+        aggregator = cls()
+        aggregator.offset = snapshot['offset']
+        aggregator.fieldnames = snapshot['fieldnames']
+        aggregator.skipped_rows = snapshot['skipped_rows']
+        aggregator.in_multi_line_record = snapshot.get('in_multi_line_record', False)
+        aggregator.fingerprint = snapshot.get('fingerprint')
+        aggregator.aggregates = snapshot['aggregates']
+        return aggregator
+
+
+def update_snapshot(log_path: str, snapshot_path: str) -> TrainingLogAggregator:
+    """Update a snapshot with the rows appended to a log, creating it if missing."""
+    if os.path.exists(snapshot_path):
+        aggregator = TrainingLogAggregator.load(snapshot_path)
+    else:
+        aggregator = TrainingLogAggregator()
+    aggregator.update(log_path)
+    aggregator.save(snapshot_path)
+    return aggregator
@@ -174,3 +174,40 @@ def parse_pace(pace_str: str) -> float:
     except ValueError as e:
         raise ValueError(e)
 
+
+def parse_age(age_str: str) -> int:
+    """Parse an age string into years.
+
+    Args:
+        age_str (str): Age in whole years, e.g. '42'.
+
+    Returns:
+        int: Age in years.
+
+    Raises:
+        ValueError: If the input is not a whole number.
+    """
+    age_str = age_str.strip()
+    if not age_str.isdigit():
+        raise ValueError(f"Given age '{age_str}' can't be parsed to an age! Please use whole years, e.g. '42'.")
+    return int(age_str)
+
+
+def parse_sex(sex_str: str) -> str:
+    """Parse a sex string into 'M' or 'F'.
+
+    Args:
+        sex_str (str): Sex, possible values: m, male, man, f, w, female, woman.
+
+    Returns:
+        str: 'M' or 'F'.
+
+    Raises:
+        ValueError: If the input is not a known value.
+    """
+    sex_str = sex_str.strip().lower()
+    if sex_str in ['m', 'male', 'man']:
+        return 'M'
+    if sex_str in ['f', 'w', 'female', 'woman']:
+        return 'F'
+    raise ValueError(f"Given sex '{sex_str}' can't be parsed! Please use 'M' or 'F'.")
@@ -1,8 +1,16 @@
+from collections.abc import Sequence
+
 from rich import print
+from rich.console import Console
 from rich.prompt import Prompt
+from rich.table import Table
 
+import pacer_py.downsample as downsample
+import pacer_py.math as ppm
 import pacer_py.user_input_parser as parser
 
+SPARKLINE_BLOCKS = "▁▂▃▄▅▆▇█"
+
 def clear_console() -> None:
     """Clear the console output."""
     print("\n" * 100)
@@ -66,3 +74,80 @@ def ask_user_for_pace() -> float:
         except ValueError as e:
             print(f"{e}, Please try again.")
     raise ValueError("Failed to parse pace after multiple attempts.")
+
+
+def ask_user_for_age() -> int:
+    """Ask the user for an age input."""
+    for _ in range(3):  # Allow up to 3 attempts
+        age_str = input("Enter age (e.g., '42'): ").strip()
+        try:
+            return parser.parse_age(age_str)
+        except ValueError as e:
+            print(f"{e}, Please try again.")
+    raise ValueError("Failed to parse age after multiple attempts.")
+
+
+def ask_user_for_sex() -> str:
+    """Ask the user for a sex input."""
+    for _ in range(3):  # Allow up to 3 attempts
+        sex_str = input("Enter sex ('M' or 'F'): ").strip()
+        try:
+            return parser.parse_sex(sex_str)
+        except ValueError as e:
+            print(f"{e}, Please try again.")
+    raise ValueError("Failed to parse sex after multiple attempts.")
+
+
+def render_sparkline(values: Sequence[float]) -> str:
+    """Render values as a single line of block characters, one per value."""
+    if not values:
+        return ""
+    low, high = min(values), max(values)
+    scale = (len(SPARKLINE_BLOCKS) - 1) / (high - low) if high > low else 0.0
+    return "".join(SPARKLINE_BLOCKS[int((v - low) * scale)] for v in values)
+
+
+def display_pace_profile(distance_m: Sequence[float], pace_min_per_km: Sequence[float], width: int | None = None) -> None:
+    """Display pace over distance as a sparkline fitting the terminal width.
+
+    The series is downsampled to one point per column first, so long
+    activities render as fast as short ones. Taller blocks mean slower pace.
+    A per-segment pace series (see `ppm.pace_series_from_stream`) may be
+    passed with the sample distances, it is plotted at the segment ends.
+    """
+    if not pace_min_per_km:
+        return
+    if len(distance_m) == len(pace_min_per_km) + 1:
+        distance_m = distance_m[1:]
+    width = width or Console().width
+    _, pace = downsample.lttb(distance_m, pace_min_per_km, max(width - 2, 1))
+    fastest = ppm.duration_to_hh_mm_ss(min(pace), 'min')
+    slowest = ppm.duration_to_hh_mm_ss(max(pace), 'min')
+    print(f"Pace profile ({fastest[1]:02d}:{fastest[2]:02d} - {slowest[1]:02d}:{slowest[2]:02d} min/km):")
+    print(f"[cyan]{render_sparkline(pace)}[/cyan]")
+
+
+def display_splits(splits_min_per_km: Sequence[float], width: int | None = None, max_rows: int = 40) -> None:
+    """Display splits as a bar chart, one row per split.
+
+    More than `max_rows` splits are reduced to the fastest and slowest split
+    of every bucket. Bars are scaled to the terminal width, longer bars mean
+    slower splits.
+    """
+    if not splits_min_per_km:
+        return
+    width = width or Console().width
+    bar_width = max(width - 20, 1)
+    split_numbers = [float(n) for n in range(1, len(splits_min_per_km) + 1)]
+    numbers, splits = downsample.min_max_buckets(split_numbers, splits_min_per_km, max(max_rows // 2, 1))
+    slowest = max(splits)
+
+    table = Table(show_header=True, box=None, pad_edge=False)
+    table.add_column("Split", justify="right")
+    table.add_column("Pace", justify="right")
+    table.add_column("")
+    for n, split in zip(numbers, splits):
+        pace_split = ppm.duration_to_hh_mm_ss(split, 'min')
+        bar = "█" * max(round(bar_width * split / slowest), 1)
+        table.add_row(str(int(n)), f"{pace_split[1]:02d}:{pace_split[2]:02d}", f"[cyan]{bar}[/cyan]")
+    print(table)
@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import pytest
+
+from pacer_py.age_grading import DISTANCE_CACHE_SIZE, TABLE_ENV_VAR, AgeGradingTables, age_grade, load_tables
+
+SAMPLE_TABLE = Path(__file__).parent / 'data' / 'age_grading_sample.csv'
+
+
+@pytest.fixture(autouse=True)
+def sample_table(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv(TABLE_ENV_VAR, str(SAMPLE_TABLE))
+
+
+def test_age_grade_open_standard() -> None:
+    assert age_grade(42195.0, 7440.0, 30, 'M') == pytest.approx((100.0, 7440.0))
+    assert age_grade(5000.0, 870.0, 25, 'F') == pytest.approx((100.0, 870.0))
+
+
+def test_age_grade_older_athlete() -> None:
+    percent_40, open_40 = age_grade(10000.0, 2400.0, 40, 'M')
+    percent_60, open_60 = age_grade(10000.0, 2400.0, 60, 'M')
+    assert percent_60 > percent_40
+    assert open_60 < open_40 < 2400.0
+
+
+def test_age_grade_junior_athlete() -> None:
+    percent_10, _ = age_grade(5000.0, 1200.0, 10, 'F')
+    percent_30, _ = age_grade(5000.0, 1200.0, 30, 'F')
+    assert percent_10 > percent_30
+    assert age_grade(5000.0, 1200.0, 10, 'F')[1] == pytest.approx(1200.0 * (0.62 + 0.80) / 2)
+
+
+def test_age_grade_non_standard_distance() -> None:
+    tables = load_tables()
+    open_10k, factors_10k = tables.distance_standards(10000.0, 'F')
+    open_15k, factors_15k = tables.distance_standards(15000.0, 'F')
+    open_hm, factors_hm = tables.distance_standards(21097.5, 'F')
+    assert (open_10k, open_hm) == pytest.approx((1800.0, 3840.0))
+    assert open_10k < open_15k < open_hm
+    assert factors_10k[50 - 8] < factors_15k[50 - 8] < factors_hm[50 - 8]
+
+
+def test_distance_standards_are_cached() -> None:
+    tables = AgeGradingTables.from_file(SAMPLE_TABLE)
+    assert tables.distance_standards(15000.0, 'M') is tables.distance_standards(15000.0, 'M')
+    assert load_tables() is load_tables(SAMPLE_TABLE)
+
+
+def test_distance_cache_is_bounded() -> None:
+    tables = AgeGradingTables.from_file(SAMPLE_TABLE)
+    for n in range(2 * DISTANCE_CACHE_SIZE):
+        tables.age_grade(10000.0 + n * 0.1, 2400.0, 40, 'M')
+    assert len(tables._distance_cache) == DISTANCE_CACHE_SIZE
+
+
+def test_age_grade_invalid_inputs() -> None:
+    with pytest.raises(ValueError):
+        age_grade(3000.0, 600.0, 30, 'M')
+    with pytest.raises(ValueError, match="ages from 8 to 100"):
+        age_grade(10000.0, 2400.0, 6, 'M')
+    with pytest.raises(ValueError):
+        age_grade(10000.0, 2400.0, 30, 'X')
+    with pytest.raises(ValueError):
+        age_grade(10000.0, 0.0, 30, 'F')
+
+
+def test_no_table_configured(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv(TABLE_ENV_VAR)
+    with pytest.raises(ValueError, match=TABLE_ENV_VAR):
+        load_tables()
+
+
+def test_invalid_table_file(tmp_path: Path) -> None:
+    table = tmp_path / 'table.csv'
+    with pytest.raises(ValueError, match="can't be read"):
+        load_tables(table)
+    table.write_text("sex,age,5000,10000\nM,open,780,1620\nM,30,1.0,1.0\n")
+    with pytest.raises(ValueError, match="sex F needs an 'open' row"):
+        load_tables(table)
+    table.write_text("sex,age,10000,5000\n")
+    with pytest.raises(ValueError, match="increasing"):
+        AgeGradingTables.from_file(table)
+    table.write_text("sex,age,5000,10000\nM,open,780\n")
+    with pytest.raises(ValueError, match="line 2"):
+        AgeGradingTables.from_file(table)
@@ -0,0 +1,141 @@
+import csv
+import io
+import os
+import tracemalloc
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from pacer_py.batch import parse_row, run_batch
+from pacer_py.jobs import CalculateDuration, CalculatePace, Job
+
+
+def generate_rows(n: int) -> Iterator[dict[str, str]]:
+    for i in range(n):
+        yield {'distance': f"{5 + i % 10}km", 'duration': f"{20 + i % 30}:{i % 60:02d}"}
+
+
+def test_parse_row() -> None:
+    assert parse_row({'distance': '5km', 'duration': '25:00'}) == {'distance': 5000.0, 'duration': 1500}
+    assert parse_row({'pace': '5:00/km', 'distance': '', 'name': 'Anna'}) == {'pace': 0.3}
+    with pytest.raises(ValueError):
+        parse_row({'distance': '5miles'})
+
+
+def test_run_batch() -> None:
+    rows = [
+        {'pace': '5:00/km', 'distance': '10km'},
+        {'pace': '5:00/km', 'distance': 'ten'},
+        {'pace': '5:00/km', 'distance': ''},
+    ]
+    out = io.StringIO()
+    report = run_batch(CalculateDuration(), rows, out, chunk_size=2)
+    assert report['rows'] == 3
+    assert report['chunks'] == 2
+
+    results = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert [r['row'] for r in results] == ['1', '2', '3']
+    assert float(results[0]['duration']) == 3000.0
+    assert results[0]['error'] == ''
+    assert "can't be parsed" in results[1]['error']
+    assert results[2]['error'] == "Missing pace or distance in user input."
+
+
+def test_run_batch_invalid_options() -> None:
+    with pytest.raises(ValueError):
+        run_batch(CalculatePace(), [], io.StringIO(), chunk_size=0)
+    with pytest.raises(ValueError):
+        run_batch(CalculatePace(), [], io.StringIO(), memory_budget_bytes=0)
+
+
+def test_run_batch_profile() -> None:
+    report = run_batch(CalculatePace(), generate_rows(100), io.StringIO(), profile=True)
+    assert report['parse_peak_bytes'] > 0
+    assert report['execute_peak_bytes'] > 0
+    assert report['render_peak_bytes'] > 0
+
+
+def test_run_batch_memory_stays_flat() -> None:
+    budget = 512 * 1024
+    peaks = []
+    for n in (10_000, 40_000):
+        with open(os.devnull, 'w') as out:
+            report = run_batch(CalculatePace(), generate_rows(n), out, memory_budget_bytes=budget)
+        assert report['rows'] == n
+        assert report['peak_bytes'] <= budget
+        peaks.append(report['peak_bytes'])
+    assert peaks[1] <= peaks[0] * 1.2
+
+
+def test_run_batch_first_row_invalid() -> None:
+    rows = [{'distance': 'bad', 'duration': '25:00'}, {'distance': '5km', 'duration': '25:00'}]
+    out = io.StringIO()
+    run_batch(CalculatePace(), rows, out)
+    results = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert "can't be parsed" in results[0]['error']
+    assert float(results[1]['pace_min_per_km']) == 5.0
+
+
+def test_run_batch_stage_peaks_exclude_live_memory() -> None:
+    tracemalloc.start()
+    try:
+        live = [str(i) * 10 for i in range(10_000)]
+        report = run_batch(CalculatePace(), generate_rows(3), io.StringIO(), profile=True)
+        del live
+    finally:
+        tracemalloc.stop()
+    assert 0 < report['parse_peak_bytes'] < 10_000
+    assert 0 < report['execute_peak_bytes'] < 10_000
+
+
+def test_run_batch_memory_budget_excludes_caller_memory() -> None:
+    budget = 512 * 1024
+    tracemalloc.start()
+    try:
+        live = [str(i) * 10 for i in range(100_000)]
+        with open(os.devnull, 'w') as out:
+            report = run_batch(CalculatePace(), generate_rows(20_000), out, memory_budget_bytes=budget)
+        del live
+    finally:
+        tracemalloc.stop()
+    assert report['rows'] == 20_000
+    assert report['peak_bytes'] <= budget
+
+
+def test_run_batch_memory_budget_counts_memory_kept_across_chunks() -> None:
+    budget = 256 * 1024
+    out = io.StringIO()
+    with pytest.raises(MemoryError):
+        run_batch(CalculatePace(), generate_rows(100_000), out, memory_budget_bytes=budget)
+    assert 0 < len(out.getvalue()) < 100_000 * 20
+
+
+def test_run_batch_without_output_keys_all_rows_failed() -> None:
+    class FailingJob(Job):
+        def user_request(self) -> dict[str, Any]:
+            return {}
+
+        def execute(self, user_input: dict[str, Any]) -> dict[str, Any]:
+            raise ValueError("Always fails.")
+
+    out = io.StringIO()
+    run_batch(FailingJob(), generate_rows(3), out)
+    assert out.getvalue().splitlines() == ['row,error', '1,Always fails.', '2,Always fails.', '3,Always fails.']
+
+
+def test_run_batch_memory_budget_too_small() -> None:
+    with pytest.raises(MemoryError):
+        run_batch(CalculatePace(), generate_rows(100), io.StringIO(), memory_budget_bytes=1)
+
+
+def test_parse_row_only_job_columns() -> None:
+    row = {'distance': '5km', 'duration': '25:00', 'age': 'n/a', 'sex': 'x'}
+    assert parse_row(row, CalculatePace.input_keys) == {'distance': 5000.0, 'duration': 1500}
+    with pytest.raises(ValueError):
+        parse_row(row)
+
+    out = io.StringIO()
+    run_batch(CalculatePace(), [row], out)
+    results = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert float(results[0]['pace_min_per_km']) == 5.0
@@ -0,0 +1,46 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from pacer_py.age_grading import TABLE_ENV_VAR
+from pacer_py.benchmark import benchmark_cases, find_regressions, main, run_benchmarks
+
+
+def test_benchmark_cases_run() -> None:
+    results = run_benchmarks(benchmark_cases(size=20, stream_size=200), min_time_sec=0.0)
+    assert 'parse_duration_invalid' in results
+    assert 'job_calculate_pace' in results
+    for result in results.values():
+        assert result['ops_per_sec'] > 0
+        assert result['peak_bytes'] >= 0
+
+
+def test_benchmark_age_grade_needs_table(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv(TABLE_ENV_VAR, raising=False)
+    assert 'job_age_grade' not in benchmark_cases(size=20, stream_size=200)
+    monkeypatch.setenv(TABLE_ENV_VAR, str(Path(__file__).parent / 'data' / 'age_grading_sample.csv'))
+    results = run_benchmarks(benchmark_cases(size=20, stream_size=200), min_time_sec=0.0, pattern='job_age_grade')
+    assert results['job_age_grade']['ops_per_sec'] > 0
+
+
+def test_benchmark_filter() -> None:
+    results = run_benchmarks(benchmark_cases(size=20, stream_size=200), min_time_sec=0.0, pattern='parse_pace')
+    assert set(results) == {'parse_pace', 'parse_pace_invalid'}
+
+
+def test_find_regressions() -> None:
+    baseline = {'a': {'ops_per_sec': 1000.0, 'peak_bytes': 100.0}}
+    assert find_regressions({'a': {'ops_per_sec': 900.0, 'peak_bytes': 110.0}}, baseline, 0.2) == []
+    assert len(find_regressions({'a': {'ops_per_sec': 700.0, 'peak_bytes': 100.0}}, baseline, 0.2)) == 1
+    assert len(find_regressions({'a': {'ops_per_sec': 700.0, 'peak_bytes': 200.0}}, baseline, 0.2)) == 2
+    assert find_regressions({'b': {'ops_per_sec': 1.0, 'peak_bytes': 1.0}}, baseline, 0.2) == []
+
+
+def test_main_fails_on_regression(tmp_path: Path) -> None:
+    baseline = tmp_path / 'baseline.json'
+    baseline.write_text(json.dumps({'parse_option': {'ops_per_sec': 1e15, 'peak_bytes': 1e15}}))
+    args = ['--size', '10', '--stream-size', '100', '--min-time', '0', '--filter', 'parse_option']
+    assert main(args + ['--baseline', str(baseline)]) == 1
+    assert main(args + ['--save', str(baseline)]) == 0
+    assert main(args + ['--baseline', str(baseline), '--threshold', '1000']) == 0
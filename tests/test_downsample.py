@@ -0,0 +1,42 @@
+import pytest
+
+from pacer_py.downsample import lttb, min_max_buckets
+
+
+def test_lttb_keeps_endpoints_and_size() -> None:
+    x = [float(i) for i in range(1000)]
+    y = [float(i % 17) for i in range(1000)]
+    out_x, out_y = lttb(x, y, 50)
+    assert len(out_x) == len(out_y) == 50
+    assert out_x[0] == 0.0
+    assert out_x[-1] == 999.0
+    assert list(out_x) == sorted(out_x)
+
+
+def test_lttb_keeps_peak() -> None:
+    x = [float(i) for i in range(1000)]
+    y = [5.0] * 1000
+    y[500] = 9.0
+    _, out_y = lttb(x, y, 20)
+    assert max(out_y) == 9.0
+
+
+def test_lttb_small_series() -> None:
+    assert list(lttb([0.0, 1.0, 2.0], [3.0, 4.0, 5.0], 10)[1]) == [3.0, 4.0, 5.0]
+    assert list(lttb([0.0, 1.0, 2.0, 3.0], [3.0, 4.0, 5.0, 6.0], 2)[0]) == [0.0, 3.0]
+
+
+def test_min_max_buckets() -> None:
+    x = [float(i) for i in range(100)]
+    y = [float(i % 10) for i in range(100)]
+    out_x, out_y = min_max_buckets(x, y, 10)
+    assert len(out_x) == 20
+    assert list(out_y) == [0.0, 9.0] * 10
+    assert list(out_x) == sorted(out_x)
+
+
+def test_downsample_invalid_inputs() -> None:
+    with pytest.raises(ValueError):
+        lttb([0.0, 1.0], [0.0], 10)
+    with pytest.raises(ValueError):
+        min_max_buckets([0.0, 1.0], [0.0, 1.0], 0)
@@ -0,0 +1,125 @@
+import importlib.metadata
+import sys
+from pathlib import Path
+
+import pytest
+
+import pacer_py.age_grading as age_grading
+import pacer_py.jobs as jobs
+import pacer_py.user_interface as ui
+from pacer_py.jobs import CalculatePace, ExitApplication, JobFactory, job_factory
+
+PLUGIN_SOURCE = '''
+from pacer_py.jobs import ExitApplication
+
+
+class PluginJob(ExitApplication):
+    def __str__(self) -> str:
+        return "Start Plugin"
+'''
+
+
+def test_default_jobs_by_name() -> None:
+    assert job_factory.names()[:3] == ['pace', 'duration', 'distance']
+    assert job_factory.names()[-1] == 'exit'
+    assert isinstance(job_factory.get_job('pace'), CalculatePace)
+    assert job_factory.get_job('pace') is job_factory.get_job('pace')
+    assert [job_factory.label(name) for name in ('pace', 'age-grade', 'exit')] == [
+        "Start Pace Calculator", "Start Age Grading Calculator", "Exit Application"]
+
+
+def test_unknown_job() -> None:
+    factory = JobFactory(entry_point_group=None)
+    factory.register_job('not-a-job', 'pacer_py.jobs:JobFactory')
+    with pytest.raises(ValueError, match="Unknown job"):
+        factory.get_job('missing')
+    with pytest.raises(ValueError, match="is not a Job subclass"):
+        factory.get_job('not-a-job')
+
+
+def test_job_that_cant_be_loaded() -> None:
+    factory = JobFactory(entry_point_group=None)
+    factory.register_job('no-module', 'nonexistent_mod:Job')
+    factory.register_job('no-class', 'pacer_py.jobs:Missing')
+    factory.register_job('nested', 'pacer_py.age_grading:CalculateAgeGrade.Missing')
+    for name in ('no-module', 'no-class', 'nested'):
+        with pytest.raises(ValueError, match=f"Job '{name}' .* can't be loaded"):
+            factory.get_job(name)
+
+
+def test_job_is_imported_on_selection(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / 'pacer_lazy_plugin.py').write_text(PLUGIN_SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, 'pacer_lazy_plugin', raising=False)
+
+    factory = JobFactory(entry_point_group=None)
+    factory.register_job('plugin', 'pacer_lazy_plugin:PluginJob')
+    factory.register_job('exit', ExitApplication())
+    factory.register_default_job('exit')
+    assert factory.names() == ['plugin', 'exit']
+    assert 'pacer_lazy_plugin' not in sys.modules
+
+    assert factory.label('plugin') == 'plugin'
+    assert 'pacer_lazy_plugin' not in sys.modules
+
+    assert str(factory.get_job('plugin')) == "Start Plugin"
+    assert 'pacer_lazy_plugin' in sys.modules
+    assert factory.label('plugin') == "Start Plugin"
+
+
+def test_registered_label_does_not_import(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, 'pacer_labelled_plugin', raising=False)
+    factory = JobFactory(entry_point_group=None)
+    factory.register_job('plugin', 'pacer_labelled_plugin:PluginJob', "Start Plugin")
+    assert factory.label('plugin') == "Start Plugin"
+    assert 'pacer_labelled_plugin' not in sys.modules
+
+
+def test_entry_point_discovery(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / 'pacer_entry_point_plugin.py').write_text(PLUGIN_SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, 'pacer_entry_point_plugin', raising=False)
+    entry_point = importlib.metadata.EntryPoint('plugin', 'pacer_entry_point_plugin:PluginJob', jobs.JOB_ENTRY_POINT_GROUP)
+
+    def entry_points(group: str) -> list[importlib.metadata.EntryPoint]:
+        return [entry_point] if group == jobs.JOB_ENTRY_POINT_GROUP else []
+
+    monkeypatch.setattr(importlib.metadata, 'entry_points', entry_points)
+    factory = JobFactory()
+    factory.register_job('exit', ExitApplication())
+    factory.register_default_job('exit')
+    assert factory.names() == ['plugin', 'exit']
+    assert factory.label('plugin') == 'plugin'
+    assert 'pacer_entry_point_plugin' not in sys.modules
+    assert str(factory.get_job('plugin')) == "Start Plugin"
+
+
+def test_ask_user(monkeypatch: pytest.MonkeyPatch) -> None:
+    factory = JobFactory(entry_point_group=None)
+    factory.register_job('pace', 'pacer_py.jobs:CalculatePace', "Start Pace Calculator")
+    factory.register_job('exit', 'pacer_py.jobs:ExitApplication', "Exit Application")
+    factory.register_default_job('exit')
+
+    options: dict[int, str] = {}
+
+    def ask_user_for_option(opt: dict[int, str]) -> int:
+        options.update(opt)
+        return 1
+
+    monkeypatch.setattr(ui, 'ask_user_for_option', ask_user_for_option)
+    assert isinstance(factory.ask_user(), CalculatePace)
+    assert options == {1: "Start Pace Calculator", 2: "Exit Application"}
+
+    monkeypatch.setattr(ui, 'ask_user_for_option', lambda opt: -1)
+    assert isinstance(factory.ask_user(), ExitApplication)
+
+
+def test_calculate_age_grade(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv(age_grading.TABLE_ENV_VAR, str(Path(__file__).parent / 'data' / 'age_grading_sample.csv'))
+    job = job_factory.get_job('age-grade')
+    result = job.execute({'distance': 10000.0, 'duration': 2400, 'age': 45, 'sex': 'M'})
+    assert 0.0 < result['age_grade_percent'] < 100.0
+    assert result['open_duration'] < 2400
+    with pytest.raises(ValueError, match="Missing"):
+        job.execute({'distance': 10000.0, 'duration': 2400})
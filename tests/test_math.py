@@ -84,3 +84,79 @@ def test_distance_from_pace_and_duration_invalid_unit() -> None:
         pp_math.distance_from_pace_and_duration(0.005, 1000, 'yards')
     with pytest.raises(ValueError):
         pp_math.distance_from_pace_and_duration(0.005, 1000, 'miles')
+
+
+def test_energy_cost_of_running() -> None:
+    assert pp_math.energy_cost_of_running(0.0) == 3.6
+    assert pp_math.energy_cost_of_running(0.1) > 3.6
+    assert pp_math.energy_cost_of_running(-0.1) < 3.6
+    assert pp_math.energy_cost_of_running(0.9) == pp_math.energy_cost_of_running(0.45)
+
+
+def test_smooth_elevation() -> None:
+    assert list(pp_math.smooth_elevation([0.0, 2.0, 4.0, 6.0], 2)) == [0.0, 1.0, 3.0, 5.0]
+    assert list(pp_math.smooth_elevation([1.0, 2.0, 3.0], 1)) == [1.0, 2.0, 3.0]
+    with pytest.raises(ValueError):
+        pp_math.smooth_elevation([1.0, 2.0], 0)
+
+
+def test_grade_from_distance_and_elevation() -> None:
+    assert list(pp_math.grade_from_distance_and_elevation([0.0, 100.0, 100.0, 200.0], [0.0, 10.0, 10.0, 5.0])) == [0.1, 0.0, -0.05]
+    with pytest.raises(ValueError):
+        pp_math.grade_from_distance_and_elevation([0.0, 100.0], [0.0])
+    with pytest.raises(ValueError):
+        pp_math.grade_from_distance_and_elevation([100.0, 0.0], [0.0, 0.0])
+
+
+def test_grade_adjusted_pace_flat() -> None:
+    distance = [float(d) for d in range(0, 5001, 10)]
+    elevation = [100.0] * len(distance)
+    time = [d * 0.3 for d in distance]
+    assert pp_math.grade_adjusted_pace(distance, elevation, time, 'min/km') == pytest.approx(5.0)
+    assert pp_math.grade_adjusted_splits(distance, elevation, time) == pytest.approx([5.0] * 5)
+
+
+def test_grade_adjusted_pace_hill() -> None:
+    distance = [float(d) for d in range(0, 2001, 10)]
+    uphill = [d * 0.05 for d in distance]
+    downhill = [-d * 0.05 for d in distance]
+    time = [d * 0.3 for d in distance]
+    assert pp_math.grade_adjusted_pace(distance, uphill, time, 'min/km') < 5.0
+    assert pp_math.grade_adjusted_pace(distance, downhill, time, 'min/km') > 5.0
+
+
+def test_grade_adjusted_pace_invalid_inputs() -> None:
+    with pytest.raises(ValueError):
+        pp_math.grade_adjusted_pace([0.0, 100.0], [0.0, 0.0], [0.0], 'min/km')
+    with pytest.raises(ValueError):
+        pp_math.grade_adjusted_pace([0.0], [0.0], [0.0], 'min/km')
+    with pytest.raises(ValueError):
+        pp_math.grade_adjusted_splits([0.0, 100.0], [0.0, 0.0], [0.0, 30.0], split_m=0)
+    with pytest.raises(ValueError):
+        pp_math.grade_adjusted_splits([], [], [])
+
+
+def test_grade_adjusted_pace_stream_matches_batch() -> None:
+    distance = [float(d) for d in range(0, 3001, 7)]
+    elevation = [20.0 * ((d // 500) % 2) + d * 0.01 for d in distance]
+    time = [d * 0.28 for d in distance]
+    stream = pp_math.GradeAdjustedPaceStream()
+    for d, e, t in zip(distance, elevation, time):
+        stream.update(d, e, t)
+    assert stream.adjusted_distance_m == pytest.approx(pp_math.grade_adjusted_distance(distance, elevation)[-1])
+    assert stream.pace('min/km') == pytest.approx(pp_math.grade_adjusted_pace(distance, elevation, time, 'min/km'))
+
+
+def test_pace_series_from_stream() -> None:
+    paces = pp_math.pace_series_from_stream([0.0, 100.0, 100.0, 300.0], [0.0, 30.0, 40.0, 100.0], 'min/km')
+    assert list(paces) == pytest.approx([5.0, 5.0, 5.0])
+    with pytest.raises(ValueError):
+        pp_math.pace_series_from_stream([0.0, 100.0], [0.0], 'min/km')
+
+
+def test_pace_series_from_stream_stationary_start() -> None:
+    paces = pp_math.pace_series_from_stream([0.0, 0.0, 0.0, 100.0, 300.0], [0.0, 5.0, 10.0, 40.0, 100.0], 'min/km')
+    assert list(paces) == pytest.approx([5.0, 5.0, 5.0, 5.0])
+    with pytest.raises(ValueError):
+        pp_math.pace_series_from_stream([0.0, 0.0], [0.0, 5.0], 'min/km')
+    assert list(pp_math.pace_series_from_stream([0.0], [0.0], 'min/km')) == []
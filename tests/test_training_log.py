@@ -0,0 +1,137 @@
+import datetime
+from pathlib import Path
+
+import pytest
+
+from pacer_py.training_log import TrainingLogAggregator, pace_histogram_bin, periods, update_snapshot
+
+LOG_HEADER = "athlete,date,distance,duration\n"
+
+
+def test_periods() -> None:
+    assert periods(datetime.date(2024, 1, 31)) == ('2024-W05', '2024-01')
+    assert periods(datetime.date(2021, 1, 1)) == ('2020-W53', '2021-01')
+
+
+def test_pace_histogram_bin() -> None:
+    assert pace_histogram_bin(300.0) == 12
+    assert pace_histogram_bin(60.0) == 0
+    assert pace_histogram_bin(10000.0) == 47
+
+
+def test_summary() -> None:
+    aggregator = TrainingLogAggregator()
+    aggregator.add_run('anna', datetime.date(2024, 1, 29), 10000.0, 3000)
+    aggregator.add_run('anna', datetime.date(2024, 1, 31), 5000.0, 1800)
+    aggregator.add_run('anna', datetime.date(2024, 2, 1), 20000.0, 7200)
+
+    week = aggregator.weekly_summary('anna', datetime.date(2024, 2, 1))
+    assert week is not None
+    assert week['runs'] == 3
+    assert week['distance_m'] == 35000.0
+    assert week['longest_run_m'] == 20000.0
+    assert week['fastest_pace_min_per_km'] == pytest.approx(5.0)
+    assert week['slowest_pace_min_per_km'] == pytest.approx(6.0)
+    assert week['average_pace_min_per_km'] == pytest.approx(12000 / 60 / 35)
+    assert sum(week['pace_histogram']) == 3
+
+    january = aggregator.monthly_summary('anna', datetime.date(2024, 1, 1))
+    assert january is not None
+    assert january['runs'] == 2
+    assert aggregator.summary('anna', '2023-12') is None
+    assert aggregator.summary('bert', '2024-01') is None
+
+
+def test_update_reads_only_new_rows(tmp_path: Path) -> None:
+    log = tmp_path / 'log.csv'
+    snapshot = tmp_path / 'snapshot.json'
+    log.write_text(LOG_HEADER + "anna,2024-01-29,10km,50:00\nbert,2024-01-29,5k,25:00\n")
+
+    aggregator = update_snapshot(str(log), str(snapshot))
+    assert aggregator.summary('anna', '2024-01') == aggregator.monthly_summary('anna', datetime.date(2024, 1, 1))
+    assert aggregator.summary('bert', '2024-W05') is not None
+
+    with log.open('a') as f:
+        f.write("anna,2024-01-30,half marathon,1:45:00\nanna,2024-01-31,oops,10:00\nanna,2024-02-01,5k")
+    aggregator = update_snapshot(str(log), str(snapshot))
+    january = aggregator.monthly_summary('anna', datetime.date(2024, 1, 1))
+    assert january is not None
+    assert january['runs'] == 2
+    assert january['longest_run_m'] == 21097.5
+    assert aggregator.skipped_rows == 1
+
+    # The incomplete last line is read once it is finished.
+    with log.open('a') as f:
+        f.write(",20:00\n")
+    reloaded = TrainingLogAggregator.load(str(snapshot))
+    assert reloaded.update(str(log)) == 1
+    february = reloaded.monthly_summary('anna', datetime.date(2024, 2, 1))
+    assert february is not None
+    assert february['runs'] == 1
+
+
+def test_update_truncated_log(tmp_path: Path) -> None:
+    log = tmp_path / 'log.csv'
+    log.write_text(LOG_HEADER + "anna,2024-01-29,10km,50:00\n")
+    aggregator = TrainingLogAggregator()
+    aggregator.update(str(log))
+    log.write_text(LOG_HEADER)
+    with pytest.raises(ValueError, match="shorter than the snapshot"):
+        aggregator.update(str(log))
+
+
+def test_update_replaced_log(tmp_path: Path) -> None:
+    log = tmp_path / 'log.csv'
+    snapshot = tmp_path / 'snapshot.json'
+    log.write_text(LOG_HEADER + "anna,2024-01-29,10km,50:00\n")
+    update_snapshot(str(log), str(snapshot))
+    log.write_text(LOG_HEADER + "bert,2024-01-29,5k,25:00\nbert,2024-01-30,5k,24:00\n")
+    with pytest.raises(ValueError, match="doesn't match the snapshot"):
+        update_snapshot(str(log), str(snapshot))
+
+    # Appending to a long log only changes the bytes after the fingerprinted ones.
+    log.write_text(LOG_HEADER + "anna,2024-01-29,10km,50:00\n" * 500)
+    aggregator = TrainingLogAggregator()
+    aggregator.update(str(log))
+    with log.open('a') as f:
+        f.write("anna,2024-01-30,10km,50:00\n")
+    assert aggregator.update(str(log)) == 1
+
+
+def test_add_row_invalid() -> None:
+    aggregator = TrainingLogAggregator()
+    with pytest.raises(ValueError):
+        aggregator.add_row({'athlete': 'anna', 'date': '2024-13-01', 'distance': '5k', 'duration': '25:00'})
+    with pytest.raises(ValueError):
+        aggregator.add_row({'athlete': '', 'date': '2024-01-01', 'distance': '5k', 'duration': '25:00'})
+    with pytest.raises(ValueError):
+        aggregator.add_row({'athlete': 'anna', 'distance': '5k', 'duration': '25:00'})
+
+
+def test_update_skips_undecodable_and_multi_line_rows(tmp_path: Path) -> None:
+    log = tmp_path / 'log.csv'
+    log.write_bytes(LOG_HEADER.encode() + b"anna,2024-01-29,10km,50:00\n"
+                    b"\xff\xfe,2024-01-29,5k,25:00\n"
+                    b"\"anna\nsmith\",2024-01-30,5k,25:00\n"
+                    b"anna,2024-01-31,5k,25:00\n")
+    aggregator = TrainingLogAggregator()
+    assert aggregator.update(str(log)) == 4
+    assert aggregator.skipped_rows == 2
+    assert aggregator.aggregates.keys() == {'anna'}
+    assert aggregator.offset == log.stat().st_size
+    january = aggregator.monthly_summary('anna', datetime.date(2024, 1, 1))
+    assert january is not None
+    assert january['runs'] == 2
+
+    with log.open('a') as f:
+        f.write("anna,2024-02-01,5k,25:00\n")
+    assert aggregator.update(str(log)) == 1
+
+
+def test_update_unreadable_header(tmp_path: Path) -> None:
+    log = tmp_path / 'log.csv'
+    log.write_bytes(b"\xffathlete,date,distance,duration\n")
+    aggregator = TrainingLogAggregator()
+    with pytest.raises(ValueError, match="Header"):
+        aggregator.update(str(log))
+    assert aggregator.offset == 0
@@ -5,6 +5,8 @@ from pacer_py.user_input_parser import (
     parse_distance, 
     parse_option,
     parse_pace,
+    parse_age,
+    parse_sex,
 )
 
 
@@ -230,4 +232,26 @@ def test_parse_pace_invalid_inputs() -> None:
 
     with pytest.raises(ValueError, match="can't be parse"):
         parse_pace("5.5.5/km")
-    
\ No newline at end of file
+    
+
+def test_parse_age() -> None:
+    assert parse_age("42") == 42
+    assert parse_age(" 7 ") == 7
+
+    with pytest.raises(ValueError, match="can't be parsed to an age"):
+        parse_age("-3")
+    with pytest.raises(ValueError, match="can't be parsed to an age"):
+        parse_age("forty")
+    with pytest.raises(ValueError, match="can't be parsed to an age"):
+        parse_age("")
+
+
+def test_parse_sex() -> None:
+    assert parse_sex("M") == 'M'
+    assert parse_sex(" male ") == 'M'
+    assert parse_sex("f") == 'F'
+    assert parse_sex("W") == 'F'
+    assert parse_sex("Female") == 'F'
+
+    with pytest.raises(ValueError, match="can't be parsed"):
+        parse_sex("x")
@@ -0,0 +1,36 @@
+import pytest
+
+import pacer_py.math as pp_math
+from pacer_py.user_interface import display_pace_profile, display_splits, render_sparkline
+
+
+def test_render_sparkline() -> None:
+    assert render_sparkline([]) == ""
+    assert render_sparkline([1.0, 2.0, 3.0]) == "▁▄█"
+    assert render_sparkline([5.0, 5.0]) == "▁▁"
+
+
+def test_display_pace_profile_with_pace_series(capsys: pytest.CaptureFixture[str]) -> None:
+    distance = [float(d) for d in range(0, 10001, 10)]
+    time = [d * 0.3 if d <= 5000 else 1500.0 + (d - 5000) * 0.36 for d in distance]
+    display_pace_profile(distance, pp_math.pace_series_from_stream(distance, time, 'min/km'), width=42)
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "Pace profile (05:00 - 06:00 min/km):"
+    assert len(lines[1]) == 40
+    assert lines[1].startswith("▁")
+    assert lines[1].endswith("█")
+
+
+def test_display_splits(capsys: pytest.CaptureFixture[str]) -> None:
+    display_splits([5.0, 6.0], width=40)
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[1].split()[:2] == ["1", "05:00"]
+    assert lines[2].split()[:2] == ["2", "06:00"]
+    assert lines[1].count("█") == 17
+    assert lines[2].count("█") == 20
+
+
+def test_display_splits_buckets_long_lists(capsys: pytest.CaptureFixture[str]) -> None:
+    display_splits([5.0 + (n % 7) * 0.1 for n in range(100)], width=40, max_rows=10)
+    lines = capsys.readouterr().out.splitlines()
+    assert 1 < len(lines) <= 11